@@ -1,14 +1,29 @@
-from flask import Flask, request, jsonify, session
+from flask import Flask, request, jsonify, session, Response, make_response, stream_with_context
 from flask_cors import CORS
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from werkzeug.security import generate_password_hash, check_password_hash
-from datetime import datetime
+from datetime import datetime, timedelta
 import os
 from dotenv import load_dotenv
 import pymysql
+import click
+import atexit
+import threading
+import time
+import base64
+import hashlib
+import json
+import math
+import queue
+import uuid
+import zlib
 from functools import wraps
-from sqlalchemy import text
+from sqlalchemy import text, event
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload, defer, joinedload, contains_eager
+from sqlalchemy.dialects import mysql, sqlite, postgresql
+from search import InvertedIndex, TfidfIndex
 
 # Load environment variables
 load_dotenv()
@@ -21,6 +36,53 @@ app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URL', 'mysql+pymysql://root:@localhost:3306/smartpol_chatbot')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+# Write-behind vote counters: buffer votes_count/total_votes increments in
+# process, either for every poll or only for the listed poll ids
+app.config['VOTE_COUNTER_BUFFER'] = os.getenv('VOTE_COUNTER_BUFFER', 'false').lower() == 'true'
+app.config['VOTE_COUNTER_BUFFER_POLLS'] = {
+    int(poll_id) for poll_id in os.getenv('VOTE_COUNTER_BUFFER_POLLS', '').split(',') if poll_id.strip()
+}
+app.config['VOTE_COUNTER_FLUSH_MS'] = int(os.getenv('VOTE_COUNTER_FLUSH_MS', '500'))
+app.config['VOTE_COUNTER_FLUSH_VOTES'] = int(os.getenv('VOTE_COUNTER_FLUSH_VOTES', '200'))
+
+# Seconds an admin poll results entry may be served from the in-process cache
+app.config['POLL_RESULTS_CACHE_TTL'] = int(os.getenv('POLL_RESULTS_CACHE_TTL', '30'))
+
+# Live poll tally streams (Server-Sent Events), limits are per worker process
+app.config['POLL_STREAM_MAX_CONNECTIONS'] = int(os.getenv('POLL_STREAM_MAX_CONNECTIONS', '100'))
+app.config['POLL_STREAM_QUEUE_SIZE'] = int(os.getenv('POLL_STREAM_QUEUE_SIZE', '100'))
+app.config['POLL_STREAM_HEARTBEAT_SECONDS'] = int(os.getenv('POLL_STREAM_HEARTBEAT_SECONDS', '15'))
+
+# Seconds between in-process runs of the poll closing job, 0 disables it
+# (use `flask close-expired-polls` from cron instead)
+app.config['POLL_SCHEDULER_INTERVAL'] = int(os.getenv('POLL_SCHEDULER_INTERVAL', '0'))
+
+# Write-behind chat saves: POST /api/chat/history enqueues and a worker thread
+# inserts batches of up to CHAT_WRITE_FLUSH_ROWS rows or every CHAT_WRITE_FLUSH_MS
+app.config['CHAT_WRITE_BEHIND'] = os.getenv('CHAT_WRITE_BEHIND', 'false').lower() == 'true'
+app.config['CHAT_WRITE_QUEUE_SIZE'] = int(os.getenv('CHAT_WRITE_QUEUE_SIZE', '1000'))
+app.config['CHAT_WRITE_FLUSH_MS'] = int(os.getenv('CHAT_WRITE_FLUSH_MS', '200'))
+app.config['CHAT_WRITE_FLUSH_ROWS'] = int(os.getenv('CHAT_WRITE_FLUSH_ROWS', '100'))
+
+# Chat sessions idle this many days are moved to chat_archive by `flask archive-chat-sessions`
+app.config['CHAT_ARCHIVE_IDLE_DAYS'] = int(os.getenv('CHAT_ARCHIVE_IDLE_DAYS', '90'))
+app.config['CHAT_ARCHIVE_DELETE_CHUNK'] = int(os.getenv('CHAT_ARCHIVE_DELETE_CHUNK', '500'))
+
+# Seconds admin dashboard statistics are memoized per worker, 0 disables it
+app.config['STATS_CACHE_TTL'] = int(os.getenv('STATS_CACHE_TTL', '30'))
+
+# Seconds a user's chatbot context may be served from the per-worker cache
+app.config['USER_CONTEXT_CACHE_TTL'] = int(os.getenv('USER_CONTEXT_CACHE_TTL', '300'))
+
+# Half-life of a topic's weight in the per-user chatbot topic profile
+app.config['TOPIC_PROFILE_HALF_LIFE_DAYS'] = float(os.getenv('TOPIC_PROFILE_HALF_LIFE_DAYS', '30'))
+
+# Admin listing search: 'fulltext' (MySQL FULLTEXT), 'memory' (in-process BM25
+# index) or 'auto' (FULLTEXT when the index exists, otherwise memory)
+app.config['SEARCH_BACKEND'] = os.getenv('SEARCH_BACKEND', 'auto')
+# Full rebuild interval of the in-process index, picks up writes made by other workers
+app.config['SEARCH_INDEX_REFRESH_SECONDS'] = int(os.getenv('SEARCH_INDEX_REFRESH_SECONDS', '300'))
+
 # Initialize extensions
 db = SQLAlchemy(app)
 migrate = Migrate(app, db)
@@ -34,12 +96,140 @@ def admin_required(f):
             return jsonify({'error': 'Not authenticated'}), 401
         
         user = User.query.get(session['user_id'])
-        if not user or user.role != 'admin' or not user.is_active:
+        if not user or not user.is_admin or not user.is_active:
             return jsonify({'error': 'Admin access required'}), 403
             
         return f(*args, **kwargs)
     return decorated_function
 
+# Conditional GET decorator for read-mostly catalogs
+def conditional_response(*models):
+    """Answer If-None-Match with 304 before running the view.
+    
+    The ETag comes from a cheap COUNT(*), MAX(updated_at) probe of each
+    model's table plus the request path and query string, so the payload is
+    only built when the underlying rows changed. No Last-Modified is sent:
+    MAX(updated_at) alone misses deletes and same-second updates.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            probe_values = [request.full_path]
+            for model in models:
+                row_count, last_updated = db.session.query(
+                    db.func.count(model.id), db.func.max(model.updated_at)
+                ).one()
+                probe_values.append(f'{model.__tablename__}:{row_count}:{last_updated.isoformat() if last_updated else ""}')
+            
+            etag = hashlib.sha1('|'.join(probe_values).encode()).hexdigest()
+            if request.if_none_match.contains(etag):
+                response = make_response('', 304)
+            else:
+                response = make_response(f(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            
+            response.set_etag(etag)
+            response.cache_control.no_cache = True
+            return response
+        return decorated_function
+    return decorator
+
+# Keyset pagination helpers
+def encode_cursor(created_at, row_id):
+    """Encode a (timestamp, id) position as an opaque cursor string"""
+    raw = f'{created_at.isoformat()}|{row_id}'.encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    """Decode a cursor from encode_cursor; raises ValueError if it is malformed"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)).decode()
+        created_at, row_id = raw.split('|')
+        return datetime.fromisoformat(created_at), int(row_id)
+    except Exception:
+        raise ValueError('Invalid cursor')
+
+def paginate_keyset(query, timestamp_column, id_column, limit, after=None):
+    """Return (rows, next_cursor) for a newest-first page after the given cursor.
+    
+    Seeks on (timestamp, id) instead of using OFFSET, so every page costs the
+    same regardless of depth.
+    """
+    if after:
+        after_timestamp, after_id = decode_cursor(after)
+        query = query.filter(db.or_(
+            timestamp_column < after_timestamp,
+            db.and_(timestamp_column == after_timestamp, id_column < after_id)
+        ))
+    
+    rows = query.order_by(timestamp_column.desc(), id_column.desc()).limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, timestamp_column.key), getattr(last, id_column.key)
+        )
+    return rows, next_cursor
+
+# Dialect-portable upsert helpers
+def dialect_insert(model):
+    """INSERT construct of the active dialect, which supports conflict handling"""
+    dialect_name = db.engine.dialect.name
+    if dialect_name == 'mysql':
+        return mysql.insert(model)
+    if dialect_name == 'postgresql':
+        return postgresql.insert(model)
+    return sqlite.insert(model)
+
+def on_conflict_update(statement, index_elements, set_):
+    """Turn a dialect_insert() statement into an upsert on the given unique key"""
+    if db.engine.dialect.name == 'mysql':
+        return statement.on_duplicate_key_update(set_)
+    return statement.on_conflict_do_update(index_elements=index_elements, set_=set_)
+
+def count_where(condition):
+    """SUM(CASE WHEN condition THEN 1 ELSE 0 END), for counting several buckets in one scan"""
+    return db.func.sum(db.case((condition, 1), else_=0))
+
+class StatsCache:
+    """Memoizes admin statistics payloads for STATS_CACHE_TTL seconds.
+    
+    Committed policy, poll and report changes drop their key through the
+    session hooks below; vote counter updates are left to the TTL.
+    """
+    
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.lock = threading.Lock()
+        self.entries = {}  # {key: (expires_at, payload)}
+        self.generations = {}  # {key: int}, bumped on every invalidation
+    
+    def get_or_build(self, key, build):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry and entry[0] >= time.monotonic():
+                return entry[1]
+            generation = self.generations.get(key, 0)
+        
+        payload = build()
+        ttl = self.app.config['STATS_CACHE_TTL']
+        if ttl > 0:
+            with self.lock:
+                # Skip storing if the data changed while it was being built
+                if self.generations.get(key, 0) == generation:
+                    self.entries[key] = (time.monotonic() + ttl, payload)
+        return payload
+    
+    def invalidate(self, key):
+        with self.lock:
+            self.generations[key] = self.generations.get(key, 0) + 1
+            self.entries.pop(key, None)
+
+stats_cache = StatsCache(app)
+
 # User Model
 class User(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -57,6 +247,10 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
 
+    @property
+    def is_admin(self):
+        return self.role == 'admin'
+
     def set_password(self, password):
         self.password_hash = generate_password_hash(password)
 
@@ -169,6 +363,8 @@ class Polling(db.Model):
     status = db.Column(db.String(50), nullable=False, default='active')  # active, ended
     start_date = db.Column(db.DateTime, default=datetime.utcnow)
     end_date = db.Column(db.DateTime, nullable=True)
+    total_votes = db.Column(db.Integer, default=0)  # Denormalized count of polling_vote rows
+    results_snapshot = db.Column(db.Text, nullable=True)  # JSON string of final results, frozen when the poll closes
     created_by = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -178,11 +374,16 @@ class Polling(db.Model):
     options = db.relationship('PollingOption', backref='poll', cascade='all, delete-orphan')
     votes = db.relationship('PollingVote', backref='poll', cascade='all, delete-orphan')
     
-    def to_dict(self):
-        return {
+    __table_args__ = (
+        db.Index('ix_polling_created_at_id', 'created_at', 'id'),  # Keyset pagination, newest first
+        db.Index('ix_polling_status_end_date', 'status', 'end_date'),  # Closing expired polls
+    )
+    
+    def to_dict(self, fields=None):
+        """Serialize the poll; fields limits the output to the given keys"""
+        data = {
             'id': self.id,
             'title': self.title,
-            'description': self.description,
             'category': self.category,
             'type': self.type,
             'status': self.status,
@@ -191,9 +392,19 @@ class Polling(db.Model):
             'created_by': self.created_by,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'options': [option.to_dict() for option in self.options],
-            'total_votes': len(self.votes)
+            'total_votes': self.total_votes or 0
         }
+        
+        # description and options are only touched when requested so that
+        # deferred columns and unloaded relationships stay unloaded
+        if fields is None or 'description' in fields:
+            data['description'] = self.description
+        if fields is None or 'options' in fields:
+            data['options'] = [option.to_dict() for option in self.options]
+        
+        if fields is not None:
+            data = {key: value for key, value in data.items() if key in fields}
+        return data
 
 # Polling Option Model
 class PollingOption(db.Model):
@@ -236,6 +447,24 @@ class PollingVote(db.Model):
             'voted_at': self.voted_at.isoformat()
         }
 
+# Polling Vote Rollup Model
+class PollingVoteRollup(db.Model):
+    """Vote counts per poll option and voter region, maintained by vote_poll"""
+    polling_id = db.Column(db.Integer, db.ForeignKey('polling.id'), primary_key=True)
+    option_id = db.Column(db.Integer, db.ForeignKey('polling_option.id'), primary_key=True)
+    dapil = db.Column(db.String(20), primary_key=True, default='')  # '' when the voter has no dapil
+    kecamatan = db.Column(db.String(50), primary_key=True, default='')  # '' when the voter has no kecamatan
+    vote_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    def to_dict(self):
+        return {
+            'polling_id': self.polling_id,
+            'option_id': self.option_id,
+            'dapil': self.dapil or None,
+            'kecamatan': self.kecamatan or None,
+            'vote_count': self.vote_count
+        }
+
 # Policy Model
 class Policy(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -253,12 +482,14 @@ class Policy(db.Model):
     # Relationships
     creator = db.relationship('User', backref='created_policies')
     
-    def to_dict(self):
-        return {
+    # Keyset pagination index for newest-first listings
+    __table_args__ = (db.Index('ix_policy_created_at_id', 'created_at', 'id'),)
+    
+    def to_dict(self, include_content=True):
+        data = {
             'id': self.id,
             'title': self.title,
             'description': self.description,
-            'content': self.content,
             'category': self.category,
             'status': self.status,
             'policy_type': self.policy_type,
@@ -267,6 +498,10 @@ class Policy(db.Model):
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat()
         }
+        # Skipped for summaries so a deferred content column is never loaded
+        if include_content:
+            data['content'] = self.content
+        return data
 
 # Officials Model
 class Dapil(db.Model):
@@ -354,6 +589,12 @@ class ChatHistory(db.Model):
     is_user = db.Column(db.Boolean, nullable=False)  # True for user messages, False for bot messages
     timestamp = db.Column(db.DateTime, default=datetime.utcnow)
     session_id = db.Column(db.String(255), nullable=True)  # To group messages in conversations
+    client_message_id = db.Column(db.String(64), nullable=True)  # Set by clients for idempotent saves
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'client_message_id', name='uq_chat_history_user_client_message'),
+        db.Index('ix_chat_history_user_session_timestamp', 'user_id', 'session_id', 'timestamp'),
+    )
     
     # Relationships
     user = db.relationship('User', backref='chat_history')
@@ -365,9 +606,66 @@ class ChatHistory(db.Model):
             'message': self.message,
             'is_user': self.is_user,
             'timestamp': self.timestamp.isoformat(),
-            'session_id': self.session_id
+            'session_id': self.session_id,
+            'client_message_id': self.client_message_id
+        }
+
+# Chat Session Model
+class ChatSession(db.Model):
+    """Per-session summary of chat_history for the session sidebar, maintained on insert"""
+    __tablename__ = 'chat_session'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    session_id = db.Column(db.String(255), nullable=False)
+    title = db.Column(db.String(255), nullable=True)  # Start of the first user message
+    first_at = db.Column(db.DateTime, nullable=False)
+    last_message_time = db.Column(db.DateTime, nullable=False)
+    message_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'session_id', name='uq_chat_session_user_session'),
+        db.Index('ix_chat_session_user_last_message', 'user_id', 'last_message_time', 'id'),
+    )
+    
+    def to_dict(self):
+        title = self.title or 'Chat Session'
+        return {
+            'session_id': self.session_id,
+            'title': title[:50] + '...' if len(title) > 50 else title,
+            'first_at': self.first_at.isoformat(),
+            'last_message_time': self.last_message_time.isoformat(),
+            'message_count': self.message_count
         }
 
+# Chat Archive Model
+class ChatArchive(db.Model):
+    """Cold storage for idle chat sessions: one zlib-compressed JSON blob per session"""
+    __tablename__ = 'chat_archive'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    session_id = db.Column(db.String(255), nullable=False)
+    message_count = db.Column(db.Integer, nullable=False, default=0)
+    first_at = db.Column(db.DateTime, nullable=False)
+    last_at = db.Column(db.DateTime, nullable=False)
+    min_message_id = db.Column(db.Integer, nullable=True)  # Message id range, for resolving paging cursors
+    max_message_id = db.Column(db.Integer, nullable=True)
+    payload = db.Column(db.LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'), nullable=False)
+    archived_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'session_id', name='uq_chat_archive_user_session'),
+    )
+    
+    @staticmethod
+    def pack(messages):
+        return zlib.compress(json.dumps(messages, separators=(',', ':')).encode(), 6)
+    
+    def messages(self):
+        """Archived messages as ChatHistory.to_dict() dicts, oldest first"""
+        return json.loads(zlib.decompress(self.payload).decode())
+
 # Conversation Summary Model
 class ConversationSummary(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -381,6 +679,10 @@ class ConversationSummary(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'session_id', name='uq_conversation_summary_user_session'),
+    )
+    
     # Relationships
     user = db.relationship('User', backref='conversation_summaries')
     
@@ -398,6 +700,45 @@ class ConversationSummary(db.Model):
             'updated_at': self.updated_at.isoformat()
         }
 
+# User Topic Profile Model
+TOPIC_PROFILE_MAX_TOPICS = 50
+TOPIC_PROFILE_MIN_WEIGHT = 0.01
+
+class UserTopicProfile(db.Model):
+    """Time-decayed topic -> weight map per user, folded in from conversation summaries"""
+    __tablename__ = 'user_topic_profile'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    topics = db.Column(db.Text, nullable=False, default='{}')  # JSON {topic: weight as of decayed_at}
+    decayed_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def weights(self, now=None):
+        """Topic weights decayed to now (exponential, TOPIC_PROFILE_HALF_LIFE_DAYS half-life)"""
+        now = now or datetime.utcnow()
+        elapsed_days = max((now - self.decayed_at).total_seconds(), 0) / 86400
+        factor = 0.5 ** (elapsed_days / app.config['TOPIC_PROFILE_HALF_LIFE_DAYS'])
+        return {topic: weight * factor for topic, weight in json.loads(self.topics or '{}').items()}
+    
+    def add_topics(self, topic_weights, now=None):
+        """Decay the stored weights to now, then add topic_weights"""
+        now = now or datetime.utcnow()
+        weights = self.weights(now)
+        for topic, weight in topic_weights.items():
+            weights[topic] = weights.get(topic, 0.0) + weight
+        
+        # Keep the profile small: drop faded topics and cap the number kept
+        strongest = sorted(
+            ((topic, weight) for topic, weight in weights.items() if weight >= TOPIC_PROFILE_MIN_WEIGHT),
+            key=lambda item: -item[1]
+        )[:TOPIC_PROFILE_MAX_TOPICS]
+        self.topics = json.dumps({topic: round(weight, 4) for topic, weight in strongest})
+        self.decayed_at = now
+    
+    def top_topics(self, limit=10, now=None):
+        weights = sorted(self.weights(now).items(), key=lambda item: -item[1])[:limit]
+        return [{'topic': topic, 'weight': round(weight, 4)} for topic, weight in weights]
+
 # Report Model
 class Report(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -414,6 +755,17 @@ class Report(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    # Keyset pagination indexes for the newest-first listings: unfiltered, per
+    # user, each single equality filter, and status together with category
+    __table_args__ = (
+        db.Index('ix_report_created_at_id', 'created_at', 'id'),
+        db.Index('ix_report_user_created_at_id', 'user_id', 'created_at', 'id'),
+        db.Index('ix_report_status_created_at_id', 'status', 'created_at', 'id'),
+        db.Index('ix_report_category_created_at_id', 'category', 'created_at', 'id'),
+        db.Index('ix_report_priority_created_at_id', 'priority', 'created_at', 'id'),
+        db.Index('ix_report_status_category_created_at_id', 'status', 'category', 'created_at', 'id'),
+    )
+    
     # Relationships
     user = db.relationship('User', foreign_keys=[user_id], backref='reports')
     resolver = db.relationship('User', foreign_keys=[resolved_by])
@@ -437,6 +789,293 @@ class Report(db.Model):
             'updated_at': self.updated_at.isoformat()
         }
 
+# Search indexes for admin policy and poll listings
+SEARCH_FILTER_MAX_IDS = 500
+
+class RefreshedTextIndex:
+    """In-process text index over a model, rebuilt every SEARCH_INDEX_REFRESH_SECONDS.
+    
+    The first build runs on the requesting thread. Later refreshes load the
+    rows and build a new index on a background thread while searches keep
+    using the current one, then swap it in. Changes committed meanwhile are
+    applied to the current index and replayed onto the new one before the swap.
+    Subclasses set index_class and implement load_documents().
+    """
+    
+    index_class = InvertedIndex
+    
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.index = self.index_class()
+        self.lock = threading.Lock()
+        self.built_at = None
+        self.pending_changes = None  # {row_id: document} while a background rebuild runs
+    
+    def load_documents(self):
+        """Return [(row_id, document), ...] for every row"""
+        raise NotImplementedError
+    
+    def build_index(self):
+        index = self.index_class()
+        for row_id, document in self.load_documents():
+            index.add(row_id, document)
+        return index
+    
+    def ensure_built(self):
+        refresh_seconds = self.app.config['SEARCH_INDEX_REFRESH_SECONDS']
+        with self.lock:
+            if self.built_at is None:
+                self.index = self.build_index()
+                self.built_at = time.monotonic()
+                return
+            if self.pending_changes is not None or time.monotonic() - self.built_at < refresh_seconds:
+                return
+            self.pending_changes = {}
+        threading.Thread(target=self._rebuild, name=f'{type(self).__name__}-rebuild', daemon=True).start()
+    
+    def _rebuild(self):
+        try:
+            with self.app.app_context():
+                index = self.build_index()
+        except Exception as e:
+            print(f"Error rebuilding {type(self).__name__}: {e}")
+            with self.lock:
+                self.pending_changes = None
+            return
+        
+        with self.lock:
+            for row_id, document in self.pending_changes.items():
+                self._apply(index, row_id, document)
+            self.index = index
+            self.built_at = time.monotonic()
+            self.pending_changes = None
+    
+    @staticmethod
+    def _apply(index, row_id, document):
+        if document is None:
+            index.remove(row_id)
+        else:
+            index.add(row_id, document)
+    
+    def apply_change(self, row_id, document):
+        """Update a committed row in the index; document None removes it"""
+        with self.lock:
+            if self.built_at is None:
+                return
+            self._apply(self.index, row_id, document)
+            if self.pending_changes is not None:
+                self.pending_changes[row_id] = document
+
+class ModelSearchIndex(RefreshedTextIndex):
+    """Relevance search over a model's title and description.
+    
+    Uses MySQL FULLTEXT when configured or available, otherwise an in-process
+    BM25 inverted index that is kept current by the session commit hooks below
+    and rebuilt in the background every SEARCH_INDEX_REFRESH_SECONDS.
+    """
+    
+    def __init__(self, flask_app, model, fulltext_index_name):
+        super().__init__(flask_app)
+        self.model = model
+        self.fulltext_index_name = fulltext_index_name
+        self.fulltext_available = None
+    
+    @staticmethod
+    def document_text(title, description):
+        # Title terms count twice so title matches rank higher
+        return f'{title or ""} {title or ""} {description or ""}'
+    
+    def instance_document(self, instance):
+        return self.document_text(instance.title, instance.description)
+    
+    def uses_fulltext(self):
+        backend = self.app.config['SEARCH_BACKEND']
+        if backend != 'auto':
+            return backend == 'fulltext'
+        if self.fulltext_available is None:
+            self.fulltext_available = db.engine.dialect.name == 'mysql' and any(
+                index['name'] == self.fulltext_index_name
+                for index in db.inspect(db.engine).get_indexes(self.model.__tablename__)
+            )
+        return self.fulltext_available
+    
+    def load_documents(self):
+        rows = db.session.query(self.model.id, self.model.title, self.model.description).all()
+        return [(row_id, self.document_text(title, description)) for row_id, title, description in rows]
+    
+    def search_page(self, query, search, page, per_page):
+        """Relevance ordered page of query rows matching search: (items, total, pages)"""
+        if self.uses_fulltext():
+            relevance = mysql.match(self.model.title, self.model.description, against=search)
+            results = query.filter(relevance).order_by(
+                relevance.desc(), self.model.created_at.desc()
+            ).paginate(page=page, per_page=per_page, error_out=False)
+            return results.items, results.total, results.pages
+        
+        self.ensure_built()
+        ranked_ids = [row_id for row_id, score in self.index.search(search)]
+        if not ranked_ids:
+            return [], 0, 0
+        
+        # Apply the remaining SQL filters to the matches, keeping relevance order.
+        # Past SEARCH_FILTER_MAX_IDS matches, intersect with the filtered ids
+        # instead of binding every match into an IN list.
+        if query.whereclause is not None:
+            filtered_ids = query.with_entities(self.model.id)
+            if len(ranked_ids) <= SEARCH_FILTER_MAX_IDS:
+                filtered_ids = filtered_ids.filter(self.model.id.in_(ranked_ids))
+            matching_ids = {row_id for row_id, in filtered_ids.all()}
+            ranked_ids = [row_id for row_id in ranked_ids if row_id in matching_ids]
+        
+        total = len(ranked_ids)
+        page_ids = ranked_ids[(page - 1) * per_page:page * per_page]
+        rows = {row.id: row for row in query.filter(self.model.id.in_(page_ids)).all()} if page_ids else {}
+        return [rows[row_id] for row_id in page_ids if row_id in rows], total, math.ceil(total / per_page)
+
+search_indexes = {
+    Policy: ModelSearchIndex(app, Policy, 'ft_policy_title_description'),
+    Polling: ModelSearchIndex(app, Polling, 'ft_polling_title_description')
+}
+
+class RelatedPolicyIndex(RefreshedTextIndex):
+    """TF-IDF cosine similarity between policies for related-policy lookups.
+    
+    Covers title, description and content. Kept current by the session commit
+    hooks below and rebuilt in the background every SEARCH_INDEX_REFRESH_SECONDS.
+    """
+    
+    model = Policy
+    index_class = TfidfIndex
+    
+    @staticmethod
+    def document_text(title, description, content):
+        # Title terms count twice so shared titles weigh more
+        return f'{title or ""} {title or ""} {description or ""} {content or ""}'
+    
+    def instance_document(self, instance):
+        return self.document_text(instance.title, instance.description, instance.content)
+    
+    def load_documents(self):
+        rows = db.session.query(Policy.id, Policy.title, Policy.description, Policy.content).all()
+        return [
+            (row_id, self.document_text(title, description, content))
+            for row_id, title, description, content in rows
+        ]
+    
+    def related_to_policy(self, policy_id, limit):
+        self.ensure_built()
+        return self.index.similar_to_document(policy_id, limit)
+    
+    def related_to_text(self, text, limit):
+        self.ensure_built()
+        return self.index.similar_to_text(text, limit)
+
+related_policy_index = RelatedPolicyIndex(app)
+
+# Every in-process text index, updated together from committed session changes
+text_indexes = [*search_indexes.values(), related_policy_index]
+
+@event.listens_for(Session, 'after_flush')
+def collect_search_index_changes(db_session, flush_context):
+    changes = db_session.info.setdefault('search_index_changes', {})
+    for instance in db_session.new | db_session.dirty:
+        for text_index in text_indexes:
+            if type(instance) is text_index.model:
+                changes[(text_index, instance.id)] = text_index.instance_document(instance)
+    for instance in db_session.deleted:
+        for text_index in text_indexes:
+            if type(instance) is text_index.model:
+                changes[(text_index, instance.id)] = None
+
+@event.listens_for(Session, 'after_commit')
+def apply_search_index_changes(db_session):
+    for (text_index, row_id), document in db_session.info.pop('search_index_changes', {}).items():
+        text_index.apply_change(row_id, document)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_search_index_changes(db_session):
+    db_session.info.pop('search_index_changes', None)
+
+class UserContextCache:
+    """Per-user cache of the chatbot context payload.
+    
+    Entries live for USER_CONTEXT_CACHE_TTL seconds and are dropped when the
+    user's profile, NIK, votes or chat history change: ORM changes through the
+    session hooks below, bulk inserts by explicit invalidate() calls.
+    """
+    
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.lock = threading.Lock()
+        self.entries = {}  # {user_id: (expires_at, context)}
+        self.generations = {}  # {user_id: int}, bumped on every invalidation
+    
+    def generation(self, user_id):
+        with self.lock:
+            return self.generations.get(user_id, 0)
+    
+    def get(self, user_id):
+        with self.lock:
+            entry = self.entries.get(user_id)
+            if not entry:
+                return None
+            if entry[0] < time.monotonic():
+                del self.entries[user_id]
+                return None
+            return entry[1]
+    
+    def set(self, user_id, context, generation):
+        """Store context unless the user changed while it was being built"""
+        with self.lock:
+            if self.generations.get(user_id, 0) != generation:
+                return
+            self.entries[user_id] = (time.monotonic() + self.app.config['USER_CONTEXT_CACHE_TTL'], context)
+    
+    def invalidate(self, user_id):
+        with self.lock:
+            self.generations[user_id] = self.generations.get(user_id, 0) + 1
+            self.entries.pop(user_id, None)
+
+user_context_cache = UserContextCache(app)
+
+@event.listens_for(Session, 'after_flush')
+def collect_user_context_changes(db_session, flush_context):
+    user_ids = db_session.info.setdefault('user_context_changes', set())
+    for instance in db_session.new | db_session.dirty | db_session.deleted:
+        if isinstance(instance, User):
+            user_ids.add(instance.id)
+        elif isinstance(instance, (ChatHistory, PollingVote, ConversationSummary, UserTopicProfile)):
+            user_ids.add(instance.user_id)
+
+@event.listens_for(Session, 'after_commit')
+def apply_user_context_changes(db_session):
+    for user_id in db_session.info.pop('user_context_changes', ()):
+        user_context_cache.invalidate(user_id)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_user_context_changes(db_session):
+    db_session.info.pop('user_context_changes', None)
+
+# Stats payloads affected by changes to each model; bulk updates add their key to session.info['stats_changes']
+STATS_CACHE_KEYS = {Policy: 'policies', Polling: 'polls', PollingOption: 'polls', Report: 'reports'}
+
+@event.listens_for(Session, 'after_flush')
+def collect_stats_changes(db_session, flush_context):
+    keys = db_session.info.setdefault('stats_changes', set())
+    for instance in db_session.new | db_session.dirty | db_session.deleted:
+        key = STATS_CACHE_KEYS.get(type(instance))
+        if key:
+            keys.add(key)
+
+@event.listens_for(Session, 'after_commit')
+def apply_stats_changes(db_session):
+    for key in db_session.info.pop('stats_changes', ()):
+        stats_cache.invalidate(key)
+
+@event.listens_for(Session, 'after_rollback')
+def discard_stats_changes(db_session):
+    db_session.info.pop('stats_changes', None)
+
 # Routes
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -559,12 +1198,16 @@ def sync_database_data():
             if updated:
                 policies_updated += 1
         
+        # Repair denormalized vote counters from polling_vote
+        counters_updated = reconcile_vote_counters()
+        
         db.session.commit()
         
         sync_results = [
             {'table': 'users', 'updated_count': users_updated},
             {'table': 'polling', 'updated_count': polls_updated},
-            {'table': 'policy', 'updated_count': policies_updated}
+            {'table': 'policy', 'updated_count': policies_updated},
+            {'table': 'polling_vote_counters', 'updated_count': counters_updated}
         ]
         
         return jsonify({
@@ -643,7 +1286,7 @@ def login():
             allowed_roles = ['konsituen', 'dpr_ri', 'dprd', 'pimpinan_daerah']
             
             # Block admin from logging in through regular login
-            if user.role == 'admin':
+            if user.is_admin:
                 return jsonify({'error': 'Admin users must login through admin portal'}), 403
             
             # Block unauthorized roles from logging in
@@ -682,7 +1325,7 @@ def admin_login():
         
         if user and user.check_password(data['password']) and user.is_active:
             # Check if user is admin
-            if user.role != 'admin':
+            if not user.is_admin:
                 return jsonify({'error': 'Admin access required'}), 403
                 
             session['user_id'] = user.id
@@ -707,7 +1350,7 @@ def admin_logout():
             return jsonify({'error': 'Not authenticated'}), 401
         
         user = User.query.get(session['user_id'])
-        if not user or user.role != 'admin':
+        if not user or not user.is_admin:
             return jsonify({'error': 'Admin access required'}), 403
         
         # Clear session
@@ -925,33 +1568,118 @@ def verify_nik():
         return jsonify({'error': str(e)}), 500
 
 # Polling API Endpoints
+def get_user_vote_map(user_id, poll_ids):
+    """Return {polling_id: option_id} for the polls the user has voted on, in one query"""
+    if not user_id or not poll_ids:
+        return {}
+    
+    rows = db.session.query(PollingVote.polling_id, PollingVote.option_id).filter(
+        PollingVote.user_id == user_id,
+        PollingVote.polling_id.in_(poll_ids)
+    ).all()
+    return {polling_id: option_id for polling_id, option_id in rows}
+
+def reconcile_vote_counters(poll_ids=None, include_buffered=False):
+    """Recompute polling.total_votes and polling_option.votes_count from polling_vote.
+    
+    Only rows whose stored counter drifted are rewritten. Polls with buffered
+    counters are skipped unless include_buffered: web workers still hold their
+    pending increments and would add them on top of the recount. Pass it only
+    for crash recovery with the workers stopped. Returns the number of
+    repaired rows; the caller is responsible for committing.
+    """
+    if not include_buffered and app.config['VOTE_COUNTER_BUFFER']:
+        return 0
+    
+    poll_votes = db.select(db.func.count(PollingVote.id)).where(
+        PollingVote.polling_id == Polling.id
+    ).scalar_subquery()
+    option_votes = db.select(db.func.count(PollingVote.id)).where(
+        PollingVote.option_id == PollingOption.id
+    ).scalar_subquery()
+    
+    poll_update = db.update(Polling).where(
+        db.or_(Polling.total_votes.is_(None), Polling.total_votes != poll_votes)
+    ).values(total_votes=poll_votes)
+    option_update = db.update(PollingOption).where(
+        db.or_(PollingOption.votes_count.is_(None), PollingOption.votes_count != option_votes)
+    ).values(votes_count=option_votes)
+    
+    if poll_ids is not None:
+        poll_update = poll_update.where(Polling.id.in_(poll_ids))
+        option_update = option_update.where(PollingOption.polling_id.in_(poll_ids))
+    
+    buffered_poll_ids = app.config['VOTE_COUNTER_BUFFER_POLLS']
+    if not include_buffered and buffered_poll_ids:
+        poll_update = poll_update.where(Polling.id.notin_(buffered_poll_ids))
+        option_update = option_update.where(PollingOption.polling_id.notin_(buffered_poll_ids))
+    
+    repaired = 0
+    for statement in (poll_update, option_update):
+        result = db.session.execute(statement.execution_options(synchronize_session=False))
+        repaired += result.rowcount
+    
+    db.session.expire_all()
+    return repaired
+
+POLL_LIST_FIELDS = {
+    'id', 'title', 'description', 'category', 'type', 'status', 'start_date', 'end_date',
+    'created_by', 'created_at', 'updated_at', 'options', 'total_votes'
+}
+POLL_LIST_MAX_LIMIT = 100
+
 @app.route('/api/polling', methods=['GET'])
 def get_polls():
     try:
-        polls = Polling.query.order_by(Polling.created_at.desc()).all()
+        # Optional projection, e.g. fields=id,title,status,total_votes
+        fields = None
+        if request.args.get('fields'):
+            fields = {field.strip() for field in request.args['fields'].split(',') if field.strip()}
+            unknown_fields = fields - POLL_LIST_FIELDS
+            if unknown_fields:
+                return jsonify({'error': f'Unknown fields: {", ".join(sorted(unknown_fields))}'}), 400
+        
+        query = Polling.query
+        if fields is None or 'options' in fields:
+            # Options are eager loaded in one extra query instead of one per poll
+            query = query.options(selectinload(Polling.options))
+        if fields is not None and 'description' not in fields:
+            query = query.options(defer(Polling.description))
+        
+        # Pagination is opt-in: limit and/or after switch to keyset pages
+        next_cursor = None
+        if 'limit' in request.args or 'after' in request.args:
+            try:
+                limit = min(max(int(request.args.get('limit', 20)), 1), POLL_LIST_MAX_LIMIT)
+            except ValueError:
+                return jsonify({'error': 'limit must be an integer'}), 400
+            try:
+                polls, next_cursor = paginate_keyset(
+                    query, Polling.created_at, Polling.id, limit, request.args.get('after')
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        else:
+            polls = query.order_by(Polling.created_at.desc()).all()
+        
         user_id = session.get('user_id')
         
+        # Current user's votes for all listed polls in a single IN query
+        user_votes = get_user_vote_map(user_id, [poll.id for poll in polls])
+        
         polls_data = []
         for poll in polls:
-            poll_dict = poll.to_dict()
-            
-            # Check if current user has voted on this poll
-            if user_id:
-                existing_vote = PollingVote.query.filter_by(
-                    polling_id=poll.id,
-                    user_id=user_id
-                ).first()
-                poll_dict['has_voted'] = existing_vote is not None
-                if existing_vote:
-                    poll_dict['voted_option_id'] = existing_vote.option_id
-            else:
-                poll_dict['has_voted'] = False
+            poll_dict = poll.to_dict(fields)
+            poll_dict['has_voted'] = poll.id in user_votes
+            if poll.id in user_votes:
+                poll_dict['voted_option_id'] = user_votes[poll.id]
                 
             polls_data.append(poll_dict)
         
         return jsonify({
             'success': True,
-            'polls': polls_data
+            'polls': polls_data,
+            'next_cursor': next_cursor
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1005,6 +1733,331 @@ def create_poll():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def increment_vote_counters(poll_id, option_id, amount=1):
+    """Add amount to an option's votes_count and its poll's total_votes in SQL"""
+    if db.engine.dialect.name == 'mysql':
+        # MySQL supports multi-table UPDATE, so both counters move in one statement
+        db.session.execute(
+            db.update(PollingOption).where(
+                PollingOption.id == option_id,
+                Polling.id == PollingOption.polling_id
+            ).values({
+                PollingOption.votes_count: PollingOption.votes_count + amount,
+                Polling.total_votes: Polling.total_votes + amount
+            }).execution_options(synchronize_session=False)
+        )
+        return
+    
+    db.session.execute(
+        db.update(PollingOption).where(PollingOption.id == option_id).values(
+            votes_count=PollingOption.votes_count + amount
+        ).execution_options(synchronize_session=False)
+    )
+    db.session.execute(
+        db.update(Polling).where(Polling.id == poll_id).values(
+            total_votes=Polling.total_votes + amount
+        ).execution_options(synchronize_session=False)
+    )
+
+class VoteCounterBuffer:
+    """In-process write-behind accumulator for poll vote counters.
+    
+    Votes themselves are committed immediately; only the votes_count and
+    total_votes increments are coalesced per option and applied in one batched
+    UPDATE every VOTE_COUNTER_FLUSH_MS or VOTE_COUNTER_FLUSH_VOTES votes.
+    Increments lost in a crash are rebuilt with
+    `flask reconcile-votes --include-buffered` while the web workers are stopped.
+    """
+    
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.lock = threading.Lock()
+        self.pending = {}  # {(poll_id, option_id): increment}
+        self.pending_votes = 0
+        self.flush_event = threading.Event()
+        self.worker = None
+    
+    def is_enabled_for(self, poll_id):
+        return self.app.config['VOTE_COUNTER_BUFFER'] or poll_id in self.app.config['VOTE_COUNTER_BUFFER_POLLS']
+    
+    def add(self, poll_id, option_id, amount=1):
+        with self.lock:
+            key = (poll_id, option_id)
+            self.pending[key] = self.pending.get(key, 0) + amount
+            self.pending_votes += amount
+            flush_now = self.pending_votes >= self.app.config['VOTE_COUNTER_FLUSH_VOTES']
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, name='vote-counter-flush', daemon=True)
+                self.worker.start()
+        
+        if flush_now:
+            self.flush_event.set()
+    
+    def _run(self):
+        while True:
+            self.flush_event.wait(self.app.config['VOTE_COUNTER_FLUSH_MS'] / 1000)
+            self.flush_event.clear()
+            self.flush()
+    
+    def flush(self):
+        """Apply all pending increments in one transaction; re-queue them on failure"""
+        with self.lock:
+            batch, self.pending = self.pending, {}
+            self.pending_votes = 0
+        
+        if not batch:
+            return 0
+        
+        option_increments = {}
+        poll_increments = {}
+        for (poll_id, option_id), amount in batch.items():
+            option_increments[option_id] = option_increments.get(option_id, 0) + amount
+            poll_increments[poll_id] = poll_increments.get(poll_id, 0) + amount
+        
+        with self.app.app_context():
+            try:
+                db.session.execute(
+                    db.update(PollingOption).where(
+                        PollingOption.id.in_(option_increments.keys())
+                    ).values(
+                        votes_count=PollingOption.votes_count + db.case(option_increments, value=PollingOption.id)
+                    ).execution_options(synchronize_session=False)
+                )
+                db.session.execute(
+                    db.update(Polling).where(
+                        Polling.id.in_(poll_increments.keys())
+                    ).values(
+                        total_votes=Polling.total_votes + db.case(poll_increments, value=Polling.id)
+                    ).execution_options(synchronize_session=False)
+                )
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                with self.lock:
+                    for key, amount in batch.items():
+                        self.pending[key] = self.pending.get(key, 0) + amount
+                        self.pending_votes += amount
+                print(f"Error flushing vote counters: {e}")
+                return 0
+        
+        return sum(batch.values())
+
+vote_counter_buffer = VoteCounterBuffer(app)
+atexit.register(vote_counter_buffer.flush)
+
+class PollResultsCache:
+    """Per-poll cache of admin results, kept current by vote_poll.
+    
+    Votes recorded by this process update cached tallies in place; the TTL
+    bounds staleness from votes handled by other workers. vote_poll calls
+    begin_vote before committing and record_vote after, so only entries built
+    before the commit (which cannot contain the vote yet) are incremented.
+    """
+    
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.lock = threading.Lock()
+        self.entries = {}  # {poll_id: (expires_at, generation, results)}
+        self.generations = {}  # {poll_id: int}, bumped on every change
+    
+    def generation(self, poll_id):
+        with self.lock:
+            return self.generations.get(poll_id, 0)
+    
+    def get(self, poll_id):
+        with self.lock:
+            entry = self.entries.get(poll_id)
+            if not entry:
+                return None
+            expires_at, _, results = entry
+            if expires_at < time.monotonic():
+                del self.entries[poll_id]
+                return None
+            return {
+                'poll': dict(results['poll']),
+                'options': [dict(option) for option in results['options']]
+            }
+    
+    def set(self, poll_id, results, generation):
+        """Store results unless the poll changed while they were being built"""
+        with self.lock:
+            if self.generations.get(poll_id, 0) != generation:
+                return
+            expires_at = time.monotonic() + self.app.config['POLL_RESULTS_CACHE_TTL']
+            self.entries[poll_id] = (expires_at, generation, {
+                'poll': dict(results['poll']),
+                'options': [dict(option) for option in results['options']]
+            })
+    
+    def begin_vote(self, poll_id):
+        """Mark a vote as about to commit; returns the mark to pass to record_vote"""
+        with self.lock:
+            self.generations[poll_id] = self.generations.get(poll_id, 0) + 1
+            return self.generations[poll_id]
+    
+    def record_vote(self, poll_id, option_id, mark):
+        with self.lock:
+            self.generations[poll_id] = self.generations.get(poll_id, 0) + 1
+            entry = self.entries.get(poll_id)
+            if not entry:
+                return
+            if entry[1] >= mark:
+                # Built after begin_vote: it may already include this vote
+                del self.entries[poll_id]
+                return
+            for option in entry[2]['options']:
+                if option['id'] == option_id:
+                    option['vote_count'] += 1
+                    return
+            # Unknown option: the cached entry is out of date
+            del self.entries[poll_id]
+    
+    def invalidate(self, poll_id):
+        with self.lock:
+            self.generations[poll_id] = self.generations.get(poll_id, 0) + 1
+            self.entries.pop(poll_id, None)
+
+poll_results_cache = PollResultsCache(app)
+
+class PollStreamSubscriber:
+    def __init__(self, poll_id, queue_size):
+        self.poll_id = poll_id
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.overflowed = False
+
+class PollEventBroker:
+    """In-process pub/sub fanning vote deltas out to live poll streams.
+    
+    Each vote takes a per-poll sequence number before it commits and is
+    published (or cancelled) after, so streams can tell which queued deltas a
+    database snapshot already contains.
+    """
+    
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.lock = threading.Lock()
+        self.subscribers = {}  # {poll_id: set of PollStreamSubscriber}
+        self.sequences = {}  # {poll_id: [votes begun, votes published or cancelled]}
+        self.connection_count = 0
+    
+    def subscribe(self, poll_id):
+        """Register a stream, or return None when the worker is at its stream cap"""
+        with self.lock:
+            if self.connection_count >= self.app.config['POLL_STREAM_MAX_CONNECTIONS']:
+                return None
+            subscriber = PollStreamSubscriber(poll_id, self.app.config['POLL_STREAM_QUEUE_SIZE'])
+            self.subscribers.setdefault(poll_id, set()).add(subscriber)
+            self.connection_count += 1
+            return subscriber
+    
+    def unsubscribe(self, subscriber):
+        with self.lock:
+            poll_subscribers = self.subscribers.get(subscriber.poll_id)
+            if poll_subscribers is None or subscriber not in poll_subscribers:
+                return
+            poll_subscribers.discard(subscriber)
+            if not poll_subscribers:
+                del self.subscribers[subscriber.poll_id]
+            self.connection_count -= 1
+    
+    def begin_vote(self, poll_id):
+        """Sequence number for a vote about to commit"""
+        with self.lock:
+            counters = self.sequences.setdefault(poll_id, [0, 0])
+            counters[0] += 1
+            return counters[0]
+    
+    def cancel_vote(self, poll_id):
+        with self.lock:
+            self.sequences[poll_id][1] += 1
+    
+    def sequence_state(self, poll_id):
+        """(votes begun, votes finished) for the poll; equal when none is in flight"""
+        with self.lock:
+            return tuple(self.sequences.get(poll_id, (0, 0)))
+    
+    def publish_vote(self, poll_id, sequence, event):
+        event = dict(event, seq=sequence)
+        with self.lock:
+            self.sequences[poll_id][1] += 1
+            poll_subscribers = list(self.subscribers.get(poll_id, ()))
+        
+        for subscriber in poll_subscribers:
+            try:
+                subscriber.queue.put_nowait(event)
+            except queue.Full:
+                # Slow consumer: its deltas are replaced by a fresh snapshot
+                subscriber.overflowed = True
+
+poll_event_broker = PollEventBroker(app)
+
+def increment_vote_rollup(poll_id, option_id, user_id):
+    """Count a vote in the voter's dapil/kecamatan rollup row with one upsert"""
+    region_source = db.select(
+        db.literal(poll_id),
+        db.literal(option_id),
+        db.func.coalesce(User.dapil, ''),
+        db.func.coalesce(User.kecamatan, ''),
+        db.literal(1)
+    ).where(User.id == user_id)
+    
+    statement = dialect_insert(PollingVoteRollup).from_select(
+        ['polling_id', 'option_id', 'dapil', 'kecamatan', 'vote_count'],
+        region_source
+    )
+    db.session.execute(on_conflict_update(
+        statement,
+        ['polling_id', 'option_id', 'dapil', 'kecamatan'],
+        {'vote_count': PollingVoteRollup.vote_count + 1}
+    ))
+
+def rebuild_vote_rollup(poll_ids=None):
+    """Recompute polling_vote_rollup from polling_vote; the caller commits"""
+    delete_rollup = db.delete(PollingVoteRollup)
+    region_counts = db.select(
+        PollingVote.polling_id,
+        PollingVote.option_id,
+        db.func.coalesce(User.dapil, ''),
+        db.func.coalesce(User.kecamatan, ''),
+        db.func.count(PollingVote.id)
+    ).join(User, User.id == PollingVote.user_id)
+    
+    if poll_ids is not None:
+        delete_rollup = delete_rollup.where(PollingVoteRollup.polling_id.in_(poll_ids))
+        region_counts = region_counts.where(PollingVote.polling_id.in_(poll_ids))
+    
+    region_counts = region_counts.group_by(
+        PollingVote.polling_id,
+        PollingVote.option_id,
+        db.func.coalesce(User.dapil, ''),
+        db.func.coalesce(User.kecamatan, '')
+    )
+    
+    db.session.execute(delete_rollup.execution_options(synchronize_session=False))
+    result = db.session.execute(db.insert(PollingVoteRollup).from_select(
+        ['polling_id', 'option_id', 'dapil', 'kecamatan', 'vote_count'],
+        region_counts
+    ))
+    return result.rowcount
+
+def vote_rejection_response(user_id, poll_id, option_id):
+    """Explain why a guarded vote insert matched no rows (slow path only)"""
+    user = User.query.get(user_id)
+    if not user:
+        return jsonify({'error': 'User not found'}), 404
+    
+    if not user.nik_verified:
+        return jsonify({'error': 'NIK verification required to vote'}), 400
+    
+    poll = Polling.query.get(poll_id)
+    if not poll:
+        return jsonify({'error': 'Poll not found'}), 404
+    
+    if poll.status != 'active':
+        return jsonify({'error': 'Poll is not active'}), 400
+    
+    return jsonify({'error': 'Invalid option for this poll'}), 400
+
 @app.route('/api/polling/<int:poll_id>/vote', methods=['POST'])
 def vote_poll(poll_id):
     try:
@@ -1013,62 +2066,66 @@ def vote_poll(poll_id):
             
         user_id = session['user_id']
         
-        # Check if user has verified NIK
-        user = User.query.get(user_id)
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-            
-        if not user.nik_verified:
-            return jsonify({'error': 'NIK verification required to vote'}), 400
-        
         data = request.get_json()
         option_id = data.get('option_id')
         
         if not option_id:
             return jsonify({'error': 'option_id is required'}), 400
         
-        # Check if poll exists and is active
-        poll = Polling.query.get(poll_id)
-        if not poll:
-            return jsonify({'error': 'Poll not found'}), 404
-        
-        if poll.status != 'active':
-            return jsonify({'error': 'Poll is not active'}), 400
-        
-        # Check if user already voted
-        existing_vote = PollingVote.query.filter_by(
-            polling_id=poll_id,
-            user_id=user_id
-        ).first()
+        # Insert the vote only if the user is NIK verified, the poll is active
+        # and the option belongs to the poll. Duplicate votes are rejected by
+        # the unique_user_poll_vote constraint instead of a pre-select.
+        vote_source = db.select(
+            db.literal(poll_id),
+            PollingOption.id,
+            User.id,
+            db.literal(datetime.utcnow())
+        ).select_from(PollingOption).join(
+            Polling, Polling.id == PollingOption.polling_id
+        ).join(
+            User, User.id == user_id
+        ).where(
+            PollingOption.id == option_id,
+            PollingOption.polling_id == poll_id,
+            Polling.status == 'active',
+            User.nik_verified.is_(True)
+        )
         
-        if existing_vote:
+        try:
+            result = db.session.execute(
+                db.insert(PollingVote).from_select(
+                    ['polling_id', 'option_id', 'user_id', 'voted_at'],
+                    vote_source
+                )
+            )
+        except IntegrityError:
+            db.session.rollback()
             return jsonify({'error': 'You have already voted on this poll'}), 400
         
-        # Verify option belongs to this poll
-        option = PollingOption.query.filter_by(
-            id=option_id,
-            polling_id=poll_id
-        ).first()
-        
-        if not option:
-            return jsonify({'error': 'Invalid option for this poll'}), 400
-        
-        # Create vote
-        vote = PollingVote(
-            polling_id=poll_id,
-            option_id=option_id,
-            user_id=user_id
-        )
+        if result.rowcount == 0:
+            db.session.rollback()
+            return vote_rejection_response(user_id, poll_id, option_id)
         
-        # Update option vote count
-        option.votes_count += 1
+        increment_vote_rollup(poll_id, option_id, user_id)
         
-        # Update poll status to completed after voting
-        poll.status = 'completed'
-        poll.end_date = datetime.utcnow()
+        results_mark = poll_results_cache.begin_vote(poll_id)
+        event_sequence = poll_event_broker.begin_vote(poll_id)
+        try:
+            if vote_counter_buffer.is_enabled_for(poll_id):
+                # Counters are applied later in a batched flush
+                db.session.commit()
+                vote_counter_buffer.add(poll_id, option_id)
+            else:
+                # Update option and poll vote counts in the same transaction
+                increment_vote_counters(poll_id, option_id)
+                db.session.commit()
+        except Exception:
+            poll_event_broker.cancel_vote(poll_id)
+            raise
         
-        db.session.add(vote)
-        db.session.commit()
+        poll_results_cache.record_vote(poll_id, option_id, results_mark)
+        poll_event_broker.publish_vote(poll_id, event_sequence, {'option_id': option_id, 'delta': 1})
+        user_context_cache.invalidate(user_id)
         
         return jsonify({
             'success': True,
@@ -1079,26 +2136,266 @@ def vote_poll(poll_id):
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def close_expired_polls(now=None):
+    """Close active polls whose end_date has passed and freeze their results.
+    
+    Closing is one set-based UPDATE. Every closed poll without a snapshot
+    (including ones closed by an admin) then gets its final per-option tallies
+    stored in results_snapshot from a single grouped query.
+    Returns (closed_count, frozen_count).
+    """
+    now = now or datetime.utcnow()
+    
+    closed = db.session.execute(
+        db.update(Polling).where(
+            Polling.status == 'active',
+            Polling.end_date.isnot(None),
+            Polling.end_date < now
+        ).values(status='completed').execution_options(synchronize_session=False)
+    ).rowcount
+    
+    unfrozen_ids = [poll_id for poll_id, in db.session.query(Polling.id).filter(
+        Polling.status != 'active',
+        Polling.results_snapshot.is_(None)
+    ).all()]
+    
+    if unfrozen_ids:
+        option_counts = db.session.query(
+            PollingOption.polling_id,
+            PollingOption.id,
+            PollingOption.option_text,
+            db.func.count(PollingVote.id)
+        ).outerjoin(
+            PollingVote, PollingVote.option_id == PollingOption.id
+        ).filter(
+            PollingOption.polling_id.in_(unfrozen_ids)
+        ).group_by(
+            PollingOption.polling_id, PollingOption.id, PollingOption.option_text
+        ).order_by(PollingOption.id).all()
+        
+        snapshots = {poll_id: [] for poll_id in unfrozen_ids}
+        for poll_id, option_id, option_text, vote_count in option_counts:
+            snapshots[poll_id].append({
+                'id': option_id,
+                'option_text': option_text,
+                'vote_count': vote_count
+            })
+        
+        db.session.execute(
+            db.update(Polling.__table__).where(
+                Polling.__table__.c.id == db.bindparam('poll_id')
+            ).values(results_snapshot=db.bindparam('snapshot')),
+            [{
+                'poll_id': poll_id,
+                'snapshot': json.dumps({
+                    'frozen_at': now.isoformat(),
+                    'total_votes': sum(option['vote_count'] for option in options),
+                    'options': options
+                }, separators=(',', ':'))
+            } for poll_id, options in snapshots.items()]
+        )
+        
+        for poll_id in unfrozen_ids:
+            poll_results_cache.invalidate(poll_id)
+    
+    if closed:
+        db.session.info.setdefault('stats_changes', set()).add('polls')
+    
+    db.session.expire_all()
+    return closed, len(unfrozen_ids)
+
+class PollLifecycleScheduler:
+    """Background thread running close_expired_polls every POLL_SCHEDULER_INTERVAL seconds"""
+    
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.lock = threading.Lock()
+        self.worker = None
+    
+    def start(self):
+        interval = self.app.config['POLL_SCHEDULER_INTERVAL']
+        if interval <= 0 or self.worker is not None:
+            return
+        with self.lock:
+            if self.worker is not None:
+                return
+            self.worker = threading.Thread(target=self._run, args=(interval,), name='poll-lifecycle', daemon=True)
+            self.worker.start()
+    
+    def _run(self, interval):
+        while True:
+            with self.app.app_context():
+                try:
+                    closed, frozen = close_expired_polls()
+                    db.session.commit()
+                    if closed or frozen:
+                        print(f"Closed {closed} expired poll(s), froze results of {frozen}")
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Error closing expired polls: {e}")
+            time.sleep(interval)
+
+poll_lifecycle_scheduler = PollLifecycleScheduler(app)
+
+@app.before_request
+def start_poll_lifecycle_scheduler():
+    poll_lifecycle_scheduler.start()
+
+POLL_STREAM_SNAPSHOT_ATTEMPTS = 3
+
+def poll_tally_snapshot(poll_id):
+    """Current per-option tallies of a poll, or None if it does not exist"""
+    poll = db.session.query(Polling.id, Polling.status, Polling.total_votes).filter(
+        Polling.id == poll_id
+    ).first()
+    if not poll:
+        return None
+    
+    if vote_counter_buffer.is_enabled_for(poll_id):
+        # Counters lag behind buffered votes, so count polling_vote like the results do
+        options = db.session.query(PollingOption.id, db.func.count(PollingVote.id)).outerjoin(
+            PollingVote, PollingVote.option_id == PollingOption.id
+        ).filter(
+            PollingOption.polling_id == poll_id
+        ).group_by(PollingOption.id).all()
+        total_votes = sum(count for _, count in options)
+    else:
+        options = db.session.query(PollingOption.id, PollingOption.votes_count).filter(
+            PollingOption.polling_id == poll_id
+        ).all()
+        total_votes = poll.total_votes or 0
+    
+    return {
+        'poll_id': poll.id,
+        'status': poll.status,
+        'total_votes': total_votes,
+        'options': {str(option_id): votes_count or 0 for option_id, votes_count in options}
+    }
+
+def consistent_poll_snapshot(poll_id, subscriber):
+    """Snapshot a subscribed poll: (snapshot, cutoff sequence), snapshot None if the poll is gone.
+    
+    Queued deltas with seq <= cutoff are already in the snapshot. A snapshot is
+    exact when no vote of this process was in flight while it was read; if none
+    is after a few attempts, the stream is flagged to resync on its next event.
+    """
+    for attempt in range(POLL_STREAM_SNAPSHOT_ATTEMPTS):
+        # End any open transaction so each attempt reads the latest commits
+        db.session.rollback()
+        begun, finished = poll_event_broker.sequence_state(poll_id)
+        snapshot = poll_tally_snapshot(poll_id)
+        if snapshot is None or (begun == finished and poll_event_broker.sequence_state(poll_id)[0] == begun):
+            return snapshot, begun
+        time.sleep(0.01)
+    
+    subscriber.overflowed = True
+    return snapshot, begun
+
+def format_sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, separators=(",", ":"))}\n\n'
+
+@app.route('/api/polling/<int:poll_id>/stream', methods=['GET'])
+def stream_poll_tallies(poll_id):
+    """Stream live tallies of a poll as Server-Sent Events"""
+    # Subscribe before snapshotting so no vote falls between the two
+    subscriber = poll_event_broker.subscribe(poll_id)
+    if subscriber is None:
+        return jsonify({'error': 'Too many live streams, please retry later'}), 503
+    
+    snapshot, cutoff = consistent_poll_snapshot(poll_id, subscriber)
+    if snapshot is None:
+        poll_event_broker.unsubscribe(subscriber)
+        return jsonify({'error': 'Poll not found'}), 404
+    
+    heartbeat_seconds = app.config['POLL_STREAM_HEARTBEAT_SECONDS']
+    
+    def generate():
+        cutoff_sequence = cutoff
+        yield format_sse('snapshot', snapshot)
+        while True:
+            try:
+                event = subscriber.queue.get(timeout=heartbeat_seconds)
+            except queue.Empty:
+                yield ': heartbeat\n\n'
+                continue
+            
+            # Coalesce everything already queued into one compact delta message
+            events = [event]
+            while True:
+                try:
+                    events.append(subscriber.queue.get_nowait())
+                except queue.Empty:
+                    break
+            
+            if subscriber.overflowed:
+                subscriber.overflowed = False
+                with app.app_context():
+                    resync, cutoff_sequence = consistent_poll_snapshot(poll_id, subscriber)
+                if resync is None:
+                    return
+                yield format_sse('snapshot', resync)
+                continue
+            
+            # Deltas at or below the cutoff are already part of the last snapshot
+            deltas = {}
+            for item in events:
+                if item['seq'] <= cutoff_sequence:
+                    continue
+                key = str(item['option_id'])
+                deltas[key] = deltas.get(key, 0) + item['delta']
+            if deltas:
+                yield format_sse('tally', {'deltas': deltas})
+    
+    response = Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache',
+        'X-Accel-Buffering': 'no'
+    })
+    response.call_on_close(lambda: poll_event_broker.unsubscribe(subscriber))
+    return response
+
 # Policy API Endpoints
+POLICY_LIST_MAX_LIMIT = 100
+
 @app.route('/api/policies', methods=['GET'])
+@conditional_response(Policy)
 def get_policies():
     try:
         status_filter = request.args.get('status')
         category_filter = request.args.get('category')
+        # view=summary leaves out the content column (fetch it from /api/policies/<id>/content)
+        summary = request.args.get('view') == 'summary'
         
         query = Policy.query
         
+        if summary:
+            query = query.options(defer(Policy.content))
+        
         if status_filter:
             query = query.filter_by(status=status_filter)
         
         if category_filter:
             query = query.filter_by(category=category_filter)
         
-        policies = query.order_by(Policy.created_at.desc()).all()
+        # Pagination is opt-in: limit and/or after switch to keyset pages
+        next_cursor = None
+        if 'limit' in request.args or 'after' in request.args:
+            try:
+                limit = min(max(int(request.args.get('limit', 20)), 1), POLICY_LIST_MAX_LIMIT)
+            except ValueError:
+                return jsonify({'error': 'limit must be an integer'}), 400
+            try:
+                policies, next_cursor = paginate_keyset(
+                    query, Policy.created_at, Policy.id, limit, request.args.get('after')
+                )
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        else:
+            policies = query.order_by(Policy.created_at.desc()).all()
         
         return jsonify({
             'success': True,
-            'policies': [policy.to_dict() for policy in policies]
+            'policies': [policy.to_dict(include_content=not summary) for policy in policies],
+            'next_cursor': next_cursor
         }), 200
         
     except Exception as e:
@@ -1143,6 +2440,89 @@ def create_policy():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/policies/<int:policy_id>/content', methods=['GET'])
+def get_policy_content(policy_id):
+    """Get only the full text of a policy, for list views that load summaries"""
+    try:
+        policy = db.session.query(Policy.id, Policy.content, Policy.updated_at).filter(
+            Policy.id == policy_id
+        ).first()
+        if not policy:
+            return jsonify({'error': 'Policy not found'}), 404
+        
+        return jsonify({
+            'success': True,
+            'policy_id': policy.id,
+            'content': policy.content,
+            'updated_at': policy.updated_at.isoformat()
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+RELATED_POLICIES_MAX_LIMIT = 50
+
+def related_policies_response(ranked):
+    """Summaries of ranked [(policy_id, score), ...] in score order"""
+    policy_ids = [policy_id for policy_id, score in ranked]
+    policies = {policy.id: policy for policy in Policy.query.options(defer(Policy.content)).filter(
+        Policy.id.in_(policy_ids)
+    ).all()} if policy_ids else {}
+    
+    related = []
+    for policy_id, score in ranked:
+        policy = policies.get(policy_id)
+        if policy:
+            policy_data = policy.to_dict(include_content=False)
+            policy_data['score'] = round(score, 4)
+            related.append(policy_data)
+    return related
+
+@app.route('/api/policies/related', methods=['GET'])
+def get_related_policies_for_query():
+    """Policies most similar to free text (e.g. a chatbot topic), by TF-IDF cosine"""
+    try:
+        query_text = request.args.get('q', '').strip()
+        if not query_text:
+            return jsonify({'error': 'q is required'}), 400
+        try:
+            limit = min(max(int(request.args.get('limit', 5)), 1), RELATED_POLICIES_MAX_LIMIT)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        
+        ranked = related_policy_index.related_to_text(query_text, limit)
+        
+        return jsonify({
+            'success': True,
+            'query': query_text,
+            'related': related_policies_response(ranked)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/policies/<int:policy_id>/related', methods=['GET'])
+def get_related_policies(policy_id):
+    """Policies most similar to the given policy, by TF-IDF cosine"""
+    try:
+        if not db.session.query(Policy.id).filter(Policy.id == policy_id).first():
+            return jsonify({'error': 'Policy not found'}), 404
+        try:
+            limit = min(max(int(request.args.get('limit', 5)), 1), RELATED_POLICIES_MAX_LIMIT)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        
+        ranked = related_policy_index.related_to_policy(policy_id, limit)
+        
+        return jsonify({
+            'success': True,
+            'policy_id': policy_id,
+            'related': related_policies_response(ranked)
+        }), 200
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/policies/<int:policy_id>', methods=['GET'])
 def get_policy(policy_id):
     try:
@@ -1203,7 +2583,7 @@ def create_user():
 def update_user(user_id):
     
     current_user = User.query.get(session['user_id'])
-    if not current_user or current_user.role != 'admin':
+    if not current_user or not current_user.is_admin:
         return jsonify({'error': 'Admin access required'}), 403
     
     user_to_update = User.query.get(user_id)
@@ -1241,7 +2621,7 @@ def update_user(user_id):
 def delete_user(user_id):
     
     current_user = User.query.get(session['user_id'])
-    if not current_user or current_user.role != 'admin':
+    if not current_user or not current_user.is_admin:
         return jsonify({'error': 'Admin access required'}), 403
     
     user_to_delete = User.query.get(user_id)
@@ -1257,6 +2637,60 @@ def delete_user(user_id):
     
     return jsonify({'message': 'User deleted successfully'}), 200
 
+def sync_poll_options(poll_id, option_texts):
+    """Diff a poll's options against option_texts inside the current transaction.
+    
+    Options whose text is still present are kept with their votes, new texts
+    are bulk inserted and options no longer listed are bulk deleted together
+    with their votes. Returns (added_count, removed_count).
+    """
+    existing_options = db.session.query(PollingOption.id, PollingOption.option_text).filter(
+        PollingOption.polling_id == poll_id
+    ).order_by(PollingOption.id).all()
+    
+    unmatched_ids = {}  # {option_text: [option_id, ...]}
+    for option_id, option_text in existing_options:
+        unmatched_ids.setdefault(option_text, []).append(option_id)
+    
+    new_texts = []
+    for option_text in option_texts:
+        if unmatched_ids.get(option_text):
+            unmatched_ids[option_text].pop(0)
+        else:
+            new_texts.append(option_text)
+    
+    removed_ids = [option_id for option_ids in unmatched_ids.values() for option_id in option_ids]
+    
+    if removed_ids:
+        removed_votes = db.session.execute(
+            db.delete(PollingVote).where(PollingVote.option_id.in_(removed_ids))
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        db.session.execute(
+            db.delete(PollingVoteRollup).where(PollingVoteRollup.option_id.in_(removed_ids))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.execute(
+            db.delete(PollingOption).where(PollingOption.id.in_(removed_ids))
+            .execution_options(synchronize_session=False)
+        )
+        if removed_votes:
+            # Remaining options keep their counts; only the poll total loses the deleted votes
+            db.session.execute(
+                db.update(Polling).where(Polling.id == poll_id).values(
+                    total_votes=Polling.total_votes - removed_votes
+                ).execution_options(synchronize_session=False)
+            )
+    
+    if new_texts:
+        db.session.execute(db.insert(PollingOption), [
+            {'polling_id': poll_id, 'option_text': option_text}
+            for option_text in new_texts
+        ])
+    
+    db.session.expire_all()
+    return len(new_texts), len(removed_ids)
+
 @app.route('/api/admin/polls/<int:poll_id>', methods=['PUT'])
 @admin_required
 def update_poll(poll_id):
@@ -1274,6 +2708,8 @@ def update_poll(poll_id):
         poll.description = data['description']
     if 'status' in data:
         poll.status = data['status']
+        # Re-frozen by the closing job if the poll is closed again
+        poll.results_snapshot = None
     if 'start_date' in data:
         poll.start_date = datetime.strptime(data['start_date'], '%Y-%m-%d %H:%M:%S')
     if 'end_date' in data:
@@ -1286,20 +2722,16 @@ def update_poll(poll_id):
         if len(data['options']) < 2:
             return jsonify({'error': 'At least 2 options are required'}), 400
         
-        # Delete existing options
-        PollingOption.query.filter_by(polling_id=poll_id).delete()
-        
-        # Create new options
-        for option_text in data['options']:
-            if option_text and option_text.strip():  # Only add non-empty options
-                option = PollingOption(
-                    polling_id=poll_id,
-                    option_text=option_text.strip()
-                )
-                db.session.add(option)
+        # Only add non-empty options; unchanged ones keep their id and votes
+        sync_poll_options(poll_id, [
+            option_text.strip() for option_text in data['options']
+            if option_text and option_text.strip()
+        ])
+        poll.results_snapshot = None
     
     poll.updated_at = datetime.utcnow()
     db.session.commit()
+    poll_results_cache.invalidate(poll_id)
     
     return jsonify({'message': 'Poll updated successfully', 'poll': poll.to_dict()}), 200
 
@@ -1311,12 +2743,14 @@ def delete_poll(poll_id):
     if not poll:
         return jsonify({'error': 'Poll not found'}), 404
     
-    # Delete associated votes and options
+    # Delete associated votes, rollups and options
+    PollingVoteRollup.query.filter_by(polling_id=poll_id).delete()
     PollingVote.query.filter_by(polling_id=poll_id).delete()
     PollingOption.query.filter_by(polling_id=poll_id).delete()
     
     db.session.delete(poll)
     db.session.commit()
+    poll_results_cache.invalidate(poll_id)
     
     return jsonify({'message': 'Poll deleted successfully'}), 200
 
@@ -1432,7 +2866,152 @@ def create_policy_admin():
     return jsonify({'message': 'Policy created successfully', 'policy': new_policy.to_dict()}), 201
 
 # Chat History Routes
-@app.route('/api/chat/history', methods=['GET'])
+CHAT_HISTORY_DEFAULT_LIMIT = 50
+CHAT_HISTORY_MAX_LIMIT = 200
+
+def paginate_chat_history(query, user_id, limit, before_id=None, after_id=None):
+    """One keyset page of chat messages in chronological order: (messages, has_more).
+    
+    after_id pages forward from a message; otherwise the page ends just before
+    before_id, or at the newest message (tail mode). has_more tells whether
+    messages exist beyond the page in the direction being read.
+    """
+    limit = min(max(limit, 1), CHAT_HISTORY_MAX_LIMIT)
+    
+    anchor = None
+    anchor_id = after_id if after_id is not None else before_id
+    if anchor_id is not None:
+        anchor_timestamp = chat_message_timestamp(user_id, anchor_id)
+        if anchor_timestamp is None:
+            raise ValueError('Invalid cursor')
+        anchor = (anchor_timestamp, anchor_id)
+    
+    forward = after_id is not None
+    messages = chat_history_rows(query, limit + 1, anchor, forward)
+    if forward:
+        return messages[:limit], len(messages) > limit
+    return list(reversed(messages[:limit])), len(messages) > limit
+
+def chat_message_timestamp(user_id, message_id):
+    return db.session.query(ChatHistory.timestamp).filter(
+        ChatHistory.id == message_id, ChatHistory.user_id == user_id
+    ).scalar()
+
+def chat_history_rows(query, limit, anchor=None, forward=False):
+    """Up to limit messages past a (timestamp, id) anchor, nearest first"""
+    if anchor is not None:
+        anchor_timestamp, anchor_id = anchor
+        if forward:
+            query = query.filter(db.or_(
+                ChatHistory.timestamp > anchor_timestamp,
+                db.and_(ChatHistory.timestamp == anchor_timestamp, ChatHistory.id > anchor_id)
+            ))
+        else:
+            query = query.filter(db.or_(
+                ChatHistory.timestamp < anchor_timestamp,
+                db.and_(ChatHistory.timestamp == anchor_timestamp, ChatHistory.id < anchor_id)
+            ))
+    if forward:
+        query = query.order_by(ChatHistory.timestamp.asc(), ChatHistory.id.asc())
+    else:
+        query = query.order_by(ChatHistory.timestamp.desc(), ChatHistory.id.desc())
+    return query.limit(limit).all()
+
+def merge_chat_history(archives, hot_messages):
+    """Archived and hot messages as dicts in chronological order, without duplicates"""
+    merged = {}
+    for archive in archives:
+        for message in archive.messages():
+            merged[message['id']] = message
+    for message in hot_messages:
+        merged[message.id] = message.to_dict()
+    return sorted(merged.values(), key=lambda message: (message['timestamp'], message['id']))
+
+def archived_message_timestamp(archive_query, message_id):
+    """Timestamp of an archived message, decompressing only archives whose id range covers it"""
+    candidates = archive_query.options(defer(ChatArchive.payload)).filter(db.or_(
+        ChatArchive.min_message_id.is_(None),
+        db.and_(ChatArchive.min_message_id <= message_id, ChatArchive.max_message_id >= message_id)
+    )).order_by(ChatArchive.last_at.desc()).all()
+    for archive in candidates:
+        for message in archive.messages():
+            if message['id'] == message_id:
+                return datetime.fromisoformat(message['timestamp'])
+    return None
+
+def archived_chat_history_response(archive_query, query, user_id):
+    """get_chat_history for scopes that include archived sessions.
+    
+    Pages are read from chat_history with the same keyset query as hot-only
+    scopes; only archives whose first_at..last_at span overlaps the page are
+    decompressed and merged in.
+    """
+    if not any(param in request.args for param in ('limit', 'before_id', 'after_id', 'tail')):
+        hot_messages = query.order_by(ChatHistory.timestamp.asc(), ChatHistory.id.asc()).all()
+        return jsonify({'chat_history': merge_chat_history(archive_query.all(), hot_messages)}), 200
+    
+    try:
+        limit = min(max(int(request.args.get('tail') or request.args.get('limit') or CHAT_HISTORY_DEFAULT_LIMIT), 1), CHAT_HISTORY_MAX_LIMIT)
+        before_id = int(request.args['before_id']) if request.args.get('before_id') else None
+        after_id = int(request.args['after_id']) if request.args.get('after_id') else None
+    except ValueError:
+        return jsonify({'error': 'limit, tail, before_id and after_id must be integers'}), 400
+    
+    forward = after_id is not None
+    anchor = None
+    anchor_id = after_id if forward else before_id
+    if anchor_id is not None:
+        anchor_timestamp = chat_message_timestamp(user_id, anchor_id) or archived_message_timestamp(archive_query, anchor_id)
+        if anchor_timestamp is None:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        anchor = (anchor_timestamp, anchor_id)
+    
+    hot_messages = chat_history_rows(query, limit + 1, anchor, forward)
+    
+    def position(message):
+        return (message['timestamp'], message['id'])
+    
+    # Archives are visited nearest first. Once limit + 1 messages are known, an
+    # archive starting beyond the furthest of them cannot change the page, and
+    # neither can any archive after it.
+    if forward:
+        if anchor is not None:
+            archive_query = archive_query.filter(ChatArchive.last_at >= anchor[0])
+        archive_query = archive_query.order_by(ChatArchive.first_at.asc(), ChatArchive.id.asc())
+    else:
+        if anchor is not None:
+            archive_query = archive_query.filter(ChatArchive.first_at <= anchor[0])
+        archive_query = archive_query.order_by(ChatArchive.last_at.desc(), ChatArchive.id.desc())
+    
+    anchor_position = (anchor[0].isoformat(), anchor_id) if anchor is not None else None
+    collected = {message.id: message.to_dict() for message in hot_messages}
+    for archive in archive_query.options(defer(ChatArchive.payload)).all():
+        if len(collected) > limit:
+            furthest = sorted(collected.values(), key=position, reverse=not forward)[limit]['timestamp']
+            if forward and archive.first_at.isoformat() > furthest:
+                break
+            if not forward and archive.last_at.isoformat() < furthest:
+                break
+        for message in archive.messages():
+            if anchor_position is not None:
+                if forward and position(message) <= anchor_position:
+                    continue
+                if not forward and position(message) >= anchor_position:
+                    continue
+            collected.setdefault(message['id'], message)
+    
+    messages = sorted(collected.values(), key=position)
+    has_more = len(messages) > limit
+    page = messages[:limit] if forward else messages[-limit:]
+    
+    return jsonify({
+        'chat_history': page,
+        'has_more': has_more,
+        'first_id': page[0]['id'] if page else None,
+        'last_id': page[-1]['id'] if page else None
+    }), 200
+
+@app.route('/api/chat/history', methods=['GET'])
 def get_chat_history():
     if 'user_id' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
@@ -1448,13 +3027,40 @@ def get_chat_history():
     session_id = request.args.get('session_id')
     
     query = ChatHistory.query.filter_by(user_id=user_id)
+    archive_query = ChatArchive.query.filter_by(user_id=user_id)
     if session_id:
         query = query.filter_by(session_id=session_id)
+        archive_query = archive_query.filter_by(session_id=session_id)
     
-    chat_history = query.order_by(ChatHistory.timestamp.asc()).all()
+    # Archived sessions are merged back in, so callers cannot tell hot from cold
+    if db.session.query(archive_query.exists()).scalar():
+        return archived_chat_history_response(archive_query, query, user_id)
+    
+    # Paging is opt-in: limit, before_id, after_id or tail switch to bounded pages
+    if not any(param in request.args for param in ('limit', 'before_id', 'after_id', 'tail')):
+        chat_history = query.order_by(ChatHistory.timestamp.asc(), ChatHistory.id.asc()).all()
+        return jsonify({
+            'chat_history': [message.to_dict() for message in chat_history]
+        }), 200
+    
+    # tail=N is the last N messages, for the chat window's initial render
+    try:
+        limit = int(request.args.get('tail') or request.args.get('limit') or CHAT_HISTORY_DEFAULT_LIMIT)
+        before_id = int(request.args['before_id']) if request.args.get('before_id') else None
+        after_id = int(request.args['after_id']) if request.args.get('after_id') else None
+    except ValueError:
+        return jsonify({'error': 'limit, tail, before_id and after_id must be integers'}), 400
+    
+    try:
+        chat_history, has_more = paginate_chat_history(query, user_id, limit, before_id, after_id)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     
     return jsonify({
-        'chat_history': [message.to_dict() for message in chat_history]
+        'chat_history': [message.to_dict() for message in chat_history],
+        'has_more': has_more,
+        'first_id': chat_history[0].id if chat_history else None,
+        'last_id': chat_history[-1].id if chat_history else None
     }), 200
 
 @app.route('/api/chat/history', methods=['POST'])
@@ -1475,14 +3081,57 @@ def save_chat_message():
     if not data or 'message' not in data or 'is_user' not in data:
         return jsonify({'error': 'Message and is_user fields are required'}), 400
     
+    # Write-behind mode answers before the row exists; a full queue falls back to a direct insert
+    if app.config['CHAT_WRITE_BEHIND']:
+        client_id = str(data.get('client_message_id') or uuid.uuid4().hex)
+        if len(client_id) > 64:
+            return jsonify({'error': 'client_message_id is longer than 64 characters'}), 400
+        row = {
+            'user_id': user_id,
+            'message': data['message'],
+            'is_user': bool(data['is_user']),
+            'session_id': data.get('session_id'),
+            'client_message_id': client_id,
+            'timestamp': datetime.utcnow()
+        }
+        if chat_write_queue.enqueue(row):
+            return jsonify({
+                'message': 'Chat message queued',
+                'queued': True,
+                'chat_message': dict(row, id=None, timestamp=row['timestamp'].isoformat())
+            }), 202
+        
+        # Saved directly from the same row, so the client_message_id is kept
+        try:
+            saved, inserted = insert_chat_messages(user_id, row['session_id'], [row])
+            db.session.commit()
+        except IntegrityError:
+            # A queued copy of this message landed first, read it back
+            db.session.rollback()
+            saved, inserted = insert_chat_messages(user_id, row['session_id'], [row])
+            db.session.commit()
+        
+        if inserted:
+            user_context_cache.invalidate(user_id)
+        
+        return jsonify({
+            'message': 'Chat message saved successfully',
+            'chat_message': saved[row['client_message_id']].to_dict()
+        }), 201 if inserted else 200
+    
     chat_message = ChatHistory(
         user_id=user_id,
         message=data['message'],
         is_user=data['is_user'],
-        session_id=data.get('session_id')
+        session_id=data.get('session_id'),
+        timestamp=datetime.utcnow()
     )
     
     db.session.add(chat_message)
+    record_chat_session_messages(
+        user_id, chat_message.session_id,
+        [{'message': chat_message.message, 'is_user': chat_message.is_user}], chat_message.timestamp
+    )
     db.session.commit()
     
     return jsonify({
@@ -1490,45 +3139,609 @@ def save_chat_message():
         'chat_message': chat_message.to_dict()
     }), 201
 
-@app.route('/api/chat/sessions', methods=['GET'])
-def get_chat_sessions():
+def record_chat_session_messages(user_id, session_id, messages, timestamp):
+    """Fold newly inserted messages into their chat_session row with one upsert"""
+    if not session_id or not messages:
+        return
+    first_user_message = next((message['message'] for message in messages if message['is_user']), None)
+    title = first_user_message[:255] if first_user_message else None
+    first_at = min((message['timestamp'] for message in messages if message.get('timestamp')), default=timestamp)
+    
+    statement = dialect_insert(ChatSession).values(
+        user_id=user_id,
+        session_id=session_id,
+        title=title,
+        first_at=first_at,
+        last_message_time=timestamp,
+        message_count=len(messages)
+    )
+    db.session.execute(on_conflict_update(
+        statement,
+        ['user_id', 'session_id'],
+        {
+            'title': db.func.coalesce(ChatSession.title, title),
+            'last_message_time': timestamp,
+            'message_count': ChatSession.message_count + len(messages)
+        }
+    ))
+
+def rebuild_chat_sessions(user_ids=None):
+    """Recompute chat_session from chat_history and chat_archive; the caller commits"""
+    first_message = db.aliased(ChatHistory)
+    title = db.select(db.func.substr(first_message.message, 1, 255)).where(
+        first_message.user_id == ChatHistory.user_id,
+        first_message.session_id == ChatHistory.session_id,
+        first_message.is_user.is_(True)
+    ).order_by(first_message.timestamp, first_message.id).limit(1).scalar_subquery()
+    
+    delete_sessions = db.delete(ChatSession)
+    session_rows = db.select(
+        ChatHistory.user_id,
+        ChatHistory.session_id,
+        title,
+        db.func.min(ChatHistory.timestamp),
+        db.func.max(ChatHistory.timestamp),
+        db.func.count(ChatHistory.id)
+    ).where(
+        ChatHistory.session_id.isnot(None),
+        ~db.exists().where(
+            ChatArchive.user_id == ChatHistory.user_id,
+            ChatArchive.session_id == ChatHistory.session_id
+        )
+    )
+    archives = ChatArchive.query.options(defer(ChatArchive.payload))
+    
+    if user_ids is not None:
+        delete_sessions = delete_sessions.where(ChatSession.user_id.in_(user_ids))
+        session_rows = session_rows.where(ChatHistory.user_id.in_(user_ids))
+        archives = archives.filter(ChatArchive.user_id.in_(user_ids))
+    
+    session_rows = session_rows.group_by(ChatHistory.user_id, ChatHistory.session_id)
+    
+    db.session.execute(delete_sessions.execution_options(synchronize_session=False))
+    rows = db.session.execute(db.insert(ChatSession).from_select(
+        ['user_id', 'session_id', 'title', 'first_at', 'last_message_time', 'message_count'],
+        session_rows
+    )).rowcount
+    
+    # Archived sessions come from their blob, merged with any messages added since
+    for archive in archives.all():
+        hot_messages = ChatHistory.query.filter_by(user_id=archive.user_id, session_id=archive.session_id).all()
+        messages = merge_chat_history([archive], hot_messages)
+        if not messages:
+            continue
+        first_user_message = next((message['message'] for message in messages if message['is_user']), None)
+        db.session.add(ChatSession(
+            user_id=archive.user_id,
+            session_id=archive.session_id,
+            title=first_user_message[:255] if first_user_message else None,
+            first_at=datetime.fromisoformat(messages[0]['timestamp']),
+            last_message_time=datetime.fromisoformat(messages[-1]['timestamp']),
+            message_count=len(messages)
+        ))
+        db.session.expire(archive, ['payload'])
+        rows += 1
+    return rows
+
+def archive_chat_session(user_id, session_id, delete_chunk):
+    """Move one session's hot messages into its chat_archive blob.
+    
+    The archive row is committed before the hot rows are deleted in chunks, so
+    an interrupted run leaves duplicates (merged away on read and on the next
+    run) rather than losing messages. Returns the number of messages moved.
+    """
+    hot_messages = ChatHistory.query.filter_by(user_id=user_id, session_id=session_id).order_by(
+        ChatHistory.timestamp.asc(), ChatHistory.id.asc()
+    ).all()
+    if not hot_messages:
+        return 0
+    
+    archive = ChatArchive.query.filter_by(user_id=user_id, session_id=session_id).first()
+    messages = merge_chat_history([archive] if archive else [], hot_messages)
+    if archive is None:
+        archive = ChatArchive(user_id=user_id, session_id=session_id)
+        db.session.add(archive)
+    archive.payload = ChatArchive.pack(messages)
+    archive.message_count = len(messages)
+    archive.first_at = datetime.fromisoformat(messages[0]['timestamp'])
+    archive.last_at = datetime.fromisoformat(messages[-1]['timestamp'])
+    archive.min_message_id = min(message['id'] for message in messages)
+    archive.max_message_id = max(message['id'] for message in messages)
+    archive.archived_at = datetime.utcnow()
+    db.session.commit()
+    
+    hot_ids = [message.id for message in hot_messages]
+    for start in range(0, len(hot_ids), delete_chunk):
+        db.session.execute(
+            db.delete(ChatHistory).where(
+                ChatHistory.id.in_(hot_ids[start:start + delete_chunk])
+            ).execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+    return len(hot_ids)
+
+def archive_idle_chat_sessions(idle_days=None, max_sessions=None):
+    """Archive every session idle for idle_days; returns (sessions, messages) archived"""
+    idle_days = app.config['CHAT_ARCHIVE_IDLE_DAYS'] if idle_days is None else idle_days
+    delete_chunk = app.config['CHAT_ARCHIVE_DELETE_CHUNK']
+    cutoff = datetime.utcnow() - timedelta(days=idle_days)
+    
+    # Sessions that still have hot rows; already archived ones drop out of this join
+    candidates = db.session.query(ChatSession.user_id, ChatSession.session_id).filter(
+        ChatSession.last_message_time < cutoff,
+        db.exists().where(
+            ChatHistory.user_id == ChatSession.user_id,
+            ChatHistory.session_id == ChatSession.session_id
+        )
+    ).order_by(ChatSession.last_message_time.asc())
+    if max_sessions:
+        candidates = candidates.limit(max_sessions)
+    
+    sessions_archived = messages_archived = 0
+    for user_id, session_id in candidates.all():
+        moved = archive_chat_session(user_id, session_id, delete_chunk)
+        if moved:
+            sessions_archived += 1
+            messages_archived += moved
+    return sessions_archived, messages_archived
+
+class ChatWriteQueue:
+    """Bounded in-process write-behind queue for chat messages.
+    
+    A worker thread drains it into multi-row INSERTs of up to
+    CHAT_WRITE_FLUSH_ROWS rows, waiting at most CHAT_WRITE_FLUSH_MS for a batch
+    to fill. enqueue() returns False when the queue is full or the last write
+    failed, so the caller writes synchronously. Rows already accepted are never
+    given up: a failing batch is retried with exponential back-off up to
+    MAX_BACKOFF_SECONDS apart. Rows still queued at exit are flushed by close().
+    """
+    
+    MAX_BACKOFF_SECONDS = 30
+    
+    def __init__(self, flask_app):
+        self.app = flask_app
+        self.lock = threading.Lock()
+        self.queue = queue.Queue(maxsize=flask_app.config['CHAT_WRITE_QUEUE_SIZE'])
+        self.retry = []  # rows of failed batches, written before new ones
+        self.failed_attempts = 0
+        self.stopping = threading.Event()
+        self.worker = None
+        self.stats = {
+            'enqueued': 0,
+            'written': 0,
+            'batches': 0,
+            'fallbacks': 0,
+            'failed_batches': 0,
+            'dropped': 0,
+            'max_depth': 0,
+            'last_batch_ms': None
+        }
+    
+    def depth(self):
+        with self.lock:
+            return self.queue.qsize() + len(self.retry)
+    
+    def enqueue(self, row):
+        if self.stopping.is_set():
+            return False
+        if self.failed_attempts:
+            # The database is failing; let the request see that instead of acknowledging
+            with self.lock:
+                self.stats['fallbacks'] += 1
+            return False
+        try:
+            self.queue.put_nowait(row)
+        except queue.Full:
+            with self.lock:
+                self.stats['fallbacks'] += 1
+            return False
+        
+        with self.lock:
+            self.stats['enqueued'] += 1
+            self.stats['max_depth'] = max(self.stats['max_depth'], self.queue.qsize() + len(self.retry))
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, name='chat-write-behind', daemon=True)
+                self.worker.start()
+        return True
+    
+    def metrics(self):
+        with self.lock:
+            return dict(
+                self.stats,
+                enabled=self.app.config['CHAT_WRITE_BEHIND'],
+                depth=self.queue.qsize() + len(self.retry),
+                capacity=self.queue.maxsize,
+                consecutive_failures=self.failed_attempts,
+                worker_alive=bool(self.worker and self.worker.is_alive())
+            )
+    
+    def _run(self):
+        while not self.stopping.is_set():
+            batch = self._next_batch(self.app.config['CHAT_WRITE_FLUSH_MS'] / 1000)
+            if batch and not self._write(batch):
+                # Back off exponentially before retrying a failed batch
+                base_seconds = self.app.config['CHAT_WRITE_FLUSH_MS'] / 1000
+                exponent = min(self.failed_attempts - 1, 16)
+                self.stopping.wait(min(base_seconds * 2 ** exponent, self.MAX_BACKOFF_SECONDS))
+    
+    def _next_batch(self, wait_seconds):
+        max_rows = self.app.config['CHAT_WRITE_FLUSH_ROWS']
+        with self.lock:
+            batch, self.retry = self.retry[:max_rows], self.retry[max_rows:]
+        
+        deadline = time.monotonic() + wait_seconds
+        while len(batch) < max_rows:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+    
+    def _write(self, batch):
+        """Insert a batch in one transaction; returns False and re-queues it on failure"""
+        sessions = {}
+        for row in batch:
+            sessions.setdefault((row['user_id'], row['session_id']), []).append(row)
+        
+        started = time.monotonic()
+        written = len(batch)
+        with self.app.app_context():
+            try:
+                try:
+                    db.session.execute(ChatHistory.__table__.insert(), batch)
+                    for (user_id, session_id), rows in sessions.items():
+                        record_chat_session_messages(user_id, session_id, rows, rows[-1]['timestamp'])
+                except IntegrityError:
+                    # A client_message_id was saved before (a retried request); skip those rows
+                    db.session.rollback()
+                    written = 0
+                    for (user_id, session_id), rows in sessions.items():
+                        unique_rows = {}
+                        for row in rows:
+                            unique_rows.setdefault(row['client_message_id'], row)
+                        written += insert_chat_messages(user_id, session_id, list(unique_rows.values()))[1]
+                db.session.commit()
+            except Exception as e:
+                db.session.rollback()
+                with self.lock:
+                    self.stats['failed_batches'] += 1
+                    self.failed_attempts += 1
+                    self.retry = batch + self.retry
+                print(f"Error writing queued chat messages: {e}")
+                return False
+        
+        for user_id in {row['user_id'] for row in batch}:
+            user_context_cache.invalidate(user_id)
+        
+        with self.lock:
+            self.failed_attempts = 0
+            self.stats['written'] += written
+            self.stats['batches'] += 1
+            self.stats['last_batch_ms'] = round((time.monotonic() - started) * 1000, 1)
+        return True
+    
+    def flush(self):
+        """Write everything queued right now from the calling thread; returns rows written"""
+        written = 0
+        while True:
+            batch = self._next_batch(0)
+            if not batch or not self._write(batch):
+                return written
+            written += len(batch)
+    
+    def close(self, timeout=5):
+        """Stop the worker and flush what is left (graceful shutdown)"""
+        self.stopping.set()
+        if self.worker is not None:
+            self.worker.join(timeout)
+        written = self.flush()
+        left = self.depth()
+        if left:
+            with self.lock:
+                self.stats['dropped'] += left
+            print(f"Could not write {left} queued chat message(s) at shutdown")
+        return written
+
+chat_write_queue = ChatWriteQueue(app)
+atexit.register(chat_write_queue.close)
+
+@app.route('/api/admin/chat/write-queue', methods=['GET'])
+@admin_required
+def get_chat_write_queue_metrics():
+    """Depth and throughput of this worker's chat write-behind queue"""
+    return jsonify(chat_write_queue.metrics()), 200
+
+CHAT_BATCH_MAX_MESSAGES = 100
+
+def insert_chat_messages(user_id, session_id, messages):
+    """Insert the messages not saved before (by client_message_id) in one executemany.
+    
+    Returns (rows keyed by client_message_id, number of rows inserted).
+    """
+    client_ids = [message['client_message_id'] for message in messages]
+    existing_ids = {client_id for client_id, in db.session.query(ChatHistory.client_message_id).filter(
+        ChatHistory.user_id == user_id,
+        ChatHistory.client_message_id.in_(client_ids)
+    ).all()}
+    
+    now = datetime.utcnow()
+    new_rows = [{
+        'user_id': user_id,
+        'message': message['message'],
+        'is_user': message['is_user'],
+        'session_id': session_id,
+        'client_message_id': message['client_message_id'],
+        'timestamp': message.get('timestamp', now)
+    } for message in messages if message['client_message_id'] not in existing_ids]
+    
+    if new_rows:
+        db.session.execute(ChatHistory.__table__.insert(), new_rows)
+        record_chat_session_messages(user_id, session_id, new_rows, now)
+    
+    saved = ChatHistory.query.filter(
+        ChatHistory.user_id == user_id,
+        ChatHistory.client_message_id.in_(client_ids)
+    ).all()
+    return {row.client_message_id: row for row in saved}, len(new_rows)
+
+@app.route('/api/chat/history/batch', methods=['POST'])
+def save_chat_messages_batch():
+    """Save an ordered list of chat messages for one session in a single transaction"""
     if 'user_id' not in session:
         return jsonify({'error': 'Not authenticated'}), 401
     
     user_id = session['user_id']
     
-    # Get distinct session IDs with latest message timestamp
-    sessions = db.session.query(
-        ChatHistory.session_id,
-        db.func.max(ChatHistory.timestamp).label('last_message_time'),
-        db.func.count(ChatHistory.id).label('message_count')
-    ).filter_by(user_id=user_id).filter(
-        ChatHistory.session_id.isnot(None)
-    ).group_by(ChatHistory.session_id).order_by(
-        db.func.max(ChatHistory.timestamp).desc()
-    ).all()
+    data = request.get_json()
+    if not data or not isinstance(data.get('messages'), list) or not data['messages']:
+        return jsonify({'error': 'messages must be a non-empty list'}), 400
+    if len(data['messages']) > CHAT_BATCH_MAX_MESSAGES:
+        return jsonify({'error': f'At most {CHAT_BATCH_MAX_MESSAGES} messages per batch'}), 400
+    
+    messages = []
+    for index, item in enumerate(data['messages']):
+        if not isinstance(item, dict) or not item.get('message') or 'is_user' not in item:
+            return jsonify({'error': f'messages[{index}]: message and is_user fields are required'}), 400
+        client_id = str(item.get('client_message_id') or uuid.uuid4().hex)
+        if len(client_id) > 64:
+            return jsonify({'error': f'messages[{index}]: client_message_id is longer than 64 characters'}), 400
+        messages.append({
+            'message': item['message'],
+            'is_user': bool(item['is_user']),
+            'client_message_id': client_id
+        })
     
-    session_list = []
-    for session_id, last_message_time, message_count in sessions:
-        # Get the first user message as session title
-        first_message = ChatHistory.query.filter_by(
-            user_id=user_id,
-            session_id=session_id,
-            is_user=True
-        ).order_by(ChatHistory.timestamp.asc()).first()
+    if len({message['client_message_id'] for message in messages}) != len(messages):
+        return jsonify({'error': 'client_message_id values must be unique within a batch'}), 400
+    
+    try:
+        if not db.session.query(User.id).filter(User.id == user_id).first():
+            return jsonify({'error': 'User not found'}), 404
+        
+        try:
+            saved, inserted = insert_chat_messages(user_id, data.get('session_id'), messages)
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent retry of the same batch won the insert, read its rows back
+            db.session.rollback()
+            saved, inserted = insert_chat_messages(user_id, data.get('session_id'), messages)
+            db.session.commit()
         
-        title = first_message.message[:50] + '...' if first_message and len(first_message.message) > 50 else (first_message.message if first_message else 'Chat Session')
+        if inserted:
+            user_context_cache.invalidate(user_id)
         
-        session_list.append({
-            'session_id': session_id,
-            'title': title,
-            'last_message_time': last_message_time.isoformat(),
-            'message_count': message_count
-        })
+        return jsonify({
+            'message': 'Chat messages saved successfully',
+            'inserted': inserted,
+            'duplicates': len(messages) - inserted,
+            'chat_messages': [saved[message['client_message_id']].to_dict() for message in messages]
+        }), 201 if inserted else 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+CHAT_SESSION_MAX_LIMIT = 100
+
+@app.route('/api/chat/sessions', methods=['GET'])
+def get_chat_sessions():
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    user_id = session['user_id']
+    query = ChatSession.query.filter_by(user_id=user_id)
+    
+    # Pagination is opt-in: limit and/or after switch to keyset pages
+    if 'limit' not in request.args and 'after' not in request.args:
+        sessions = query.order_by(ChatSession.last_message_time.desc(), ChatSession.id.desc()).all()
+        return jsonify({'sessions': [chat_session.to_dict() for chat_session in sessions]}), 200
+    
+    try:
+        limit = min(max(int(request.args.get('limit', 20)), 1), CHAT_SESSION_MAX_LIMIT)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    try:
+        sessions, next_cursor = paginate_keyset(
+            query, ChatSession.last_message_time, ChatSession.id, limit, request.args.get('after')
+        )
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({
+        'sessions': [chat_session.to_dict() for chat_session in sessions],
+        'next_cursor': next_cursor
+    }), 200
+
+# Chat history export
+CHAT_EXPORT_BATCH_SIZE = 1000
+CHAT_EXPORT_CHUNK_BYTES = 64 * 1024
+
+def parse_export_date(value, end_of_range=False):
+    """ISO date or datetime; a bare date as end of range covers that whole day"""
+    parsed = datetime.fromisoformat(value)
+    if end_of_range and len(value) == 10:
+        parsed += timedelta(days=1)
+    return parsed
+
+def chat_export_response(user_id=None):
+    """Stream chat_history (then archived sessions) as NDJSON in constant memory.
+    
+    Filters: session_id, start_date, end_date (ISO dates/datetimes, end exclusive
+    unless a bare date) and, for admins, user_id. gzip=true compresses on the fly.
+    """
+    session_id = request.args.get('session_id')
+    try:
+        start_date = parse_export_date(request.args['start_date']) if request.args.get('start_date') else None
+        end_date = parse_export_date(request.args['end_date'], end_of_range=True) if request.args.get('end_date') else None
+    except ValueError:
+        return jsonify({'error': 'start_date and end_date must be ISO dates'}), 400
+    use_gzip = request.args.get('gzip', 'false').lower() == 'true'
+    
+    columns = ChatHistory.__table__.c
+    hot_query = db.select(
+        columns.id, columns.user_id, columns.message, columns.is_user,
+        columns.timestamp, columns.session_id, columns.client_message_id
+    ).order_by(columns.id)
+    archive_query = db.select(ChatArchive).order_by(ChatArchive.id)
+    if user_id is not None:
+        hot_query = hot_query.where(columns.user_id == user_id)
+        archive_query = archive_query.where(ChatArchive.user_id == user_id)
+    if session_id:
+        hot_query = hot_query.where(columns.session_id == session_id)
+        archive_query = archive_query.where(ChatArchive.session_id == session_id)
+    if start_date:
+        hot_query = hot_query.where(columns.timestamp >= start_date)
+        archive_query = archive_query.where(ChatArchive.last_at >= start_date)
+    if end_date:
+        hot_query = hot_query.where(columns.timestamp < end_date)
+        archive_query = archive_query.where(ChatArchive.first_at < end_date)
+    
+    def in_range(timestamp):
+        return (start_date is None or timestamp >= start_date) and (end_date is None or timestamp < end_date)
+    
+    def lines():
+        # Server-side cursor: rows arrive in batches instead of one big fetch
+        for row in db.session.execute(hot_query.execution_options(yield_per=CHAT_EXPORT_BATCH_SIZE)):
+            yield json.dumps({
+                'id': row.id,
+                'user_id': row.user_id,
+                'message': row.message,
+                'is_user': row.is_user,
+                'timestamp': row.timestamp.isoformat(),
+                'session_id': row.session_id,
+                'client_message_id': row.client_message_id
+            }) + '\n'
+        
+        # Archived sessions follow, one decompressed blob at a time
+        for archive in db.session.scalars(archive_query.execution_options(yield_per=1)):
+            for message in archive.messages():
+                if in_range(datetime.fromisoformat(message['timestamp'])):
+                    yield json.dumps(message) + '\n'
+            db.session.expunge(archive)
+    
+    def chunks():
+        buffer = []
+        buffered_bytes = 0
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if use_gzip else None
+        for line in lines():
+            encoded = line.encode()
+            buffer.append(encoded)
+            buffered_bytes += len(encoded)
+            if buffered_bytes >= CHAT_EXPORT_CHUNK_BYTES:
+                data = b''.join(buffer)
+                buffer, buffered_bytes = [], 0
+                data = compressor.compress(data) if compressor else data
+                if data:
+                    yield data
+        data = b''.join(buffer)
+        yield compressor.compress(data) + compressor.flush() if compressor else data
+    
+    filename = f"chat-history-{user_id if user_id is not None else 'all'}-{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.ndjson"
+    return Response(
+        stream_with_context(chunks()),
+        mimetype='application/gzip' if use_gzip else 'application/x-ndjson',
+        headers={
+            'Content-Disposition': f'attachment; filename={filename}{".gz" if use_gzip else ""}',
+            'X-Accel-Buffering': 'no'
+        }
+    )
+
+@app.route('/api/chat/history/export', methods=['GET'])
+def export_chat_history():
+    """Download the current user's chat history as NDJSON"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
     
-    return jsonify({'sessions': session_list}), 200
+    return chat_export_response(session['user_id'])
+
+@app.route('/api/admin/chat/history/export', methods=['GET'])
+@admin_required
+def export_all_chat_history():
+    """Download the platform's chat history (optionally ?user_id=) as NDJSON"""
+    user_id = request.args.get('user_id')
+    if user_id is not None and not user_id.isdigit():
+        return jsonify({'error': 'user_id must be an integer'}), 400
+    
+    return chat_export_response(int(user_id) if user_id is not None else None)
 
 # Conversation Summary Routes
+def parse_summary_topics(raw_topics):
+    """{topic: weight} from a summary's topics: a JSON list of names, a JSON {topic: weight} map or plain comma separated text"""
+    if not raw_topics:
+        return {}
+    try:
+        value = json.loads(raw_topics) if isinstance(raw_topics, str) else raw_topics
+    except ValueError:
+        value = raw_topics.split(',')
+    
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = [(item, 1.0) for item in value]
+    else:
+        return {}
+    
+    topic_weights = {}
+    for topic, weight in items:
+        if not isinstance(topic, str) or not isinstance(weight, (int, float)) or weight <= 0:
+            continue
+        topic = ' '.join(topic.lower().split())[:100]
+        if topic:
+            topic_weights[topic] = topic_weights.get(topic, 0.0) + float(weight)
+    return topic_weights
+
+def record_topic_interest(user_id, topic_weights, now=None):
+    """Fold topic weights into the user's topic profile row; the caller commits"""
+    now = now or datetime.utcnow()
+    # Make sure the row exists, then lock it so concurrent saves do not lose updates
+    db.session.execute(on_conflict_update(
+        dialect_insert(UserTopicProfile).values(user_id=user_id, topics='{}', decayed_at=now),
+        ['user_id'],
+        {'user_id': user_id}
+    ))
+    profile = UserTopicProfile.query.filter_by(user_id=user_id).with_for_update().one()
+    profile.add_topics(topic_weights, now)
+    return profile
+
+TOPIC_PROFILE_DEFAULT_LIMIT = 10
+
+@app.route('/api/chatbot/topic-profile', methods=['GET'])
+def get_topic_profile():
+    """The current user's strongest chat topics, decayed to now"""
+    if 'user_id' not in session:
+        return jsonify({'error': 'Not authenticated'}), 401
+    
+    try:
+        limit = min(max(int(request.args.get('limit', TOPIC_PROFILE_DEFAULT_LIMIT)), 1), TOPIC_PROFILE_MAX_TOPICS)
+    except ValueError:
+        return jsonify({'error': 'limit must be an integer'}), 400
+    
+    profile = db.session.get(UserTopicProfile, session['user_id'])
+    return jsonify({
+        'topics': profile.top_topics(limit) if profile else [],
+        'updated_at': profile.updated_at.isoformat() if profile and profile.updated_at else None
+    }), 200
+
 @app.route('/api/chat/summary', methods=['POST'])
 def save_conversation_summary():
     if 'user_id' not in session:
@@ -1539,53 +3752,66 @@ def save_conversation_summary():
         return jsonify({'error': 'Missing required fields'}), 400
     
     user_id = session['user_id']
+    now = datetime.utcnow()
     
-    # Check if summary already exists for this session
-    existing_summary = ConversationSummary.query.filter_by(
+    # Topics already counted for this session are not added to the profile again
+    existing_id, previous_topics = db.session.query(
+        ConversationSummary.id, ConversationSummary.topics
+    ).filter_by(
         user_id=user_id,
         session_id=data['session_id']
-    ).first()
+    ).first() or (None, None)
+    new_topics = parse_summary_topics(data.get('topics'))
+    for topic in parse_summary_topics(previous_topics):
+        new_topics.pop(topic, None)
+    
+    fields = {
+        'summary': data['summary'],
+        'topics': data.get('topics'),
+        'message_count': data.get('message_count', 0),
+        'is_polling_related': data.get('is_polling_related', False),
+        'polling_topics': data.get('polling_topics'),
+        'updated_at': now
+    }
     
-    if existing_summary:
-        # Update existing summary
-        existing_summary.summary = data['summary']
-        existing_summary.topics = data.get('topics')
-        existing_summary.message_count = data.get('message_count', 0)
-        existing_summary.is_polling_related = data.get('is_polling_related', False)
-        existing_summary.polling_topics = data.get('polling_topics')
-        existing_summary.updated_at = datetime.utcnow()
-        
-        try:
-            db.session.commit()
-            return jsonify({
-                'message': 'Conversation summary updated successfully',
-                'summary': existing_summary.to_dict()
-            }), 200
-        except Exception as e:
-            db.session.rollback()
-            return jsonify({'error': str(e)}), 500
-    else:
-        # Create new summary
-        conversation_summary = ConversationSummary(
+    try:
+        # One atomic upsert on (user_id, session_id), so concurrent saves cannot duplicate
+        statement = dialect_insert(ConversationSummary).values(
             user_id=user_id,
             session_id=data['session_id'],
-            summary=data['summary'],
-            topics=data.get('topics'),
-            message_count=data.get('message_count', 0),
-            is_polling_related=data.get('is_polling_related', False),
-            polling_topics=data.get('polling_topics')
+            created_at=now,
+            **fields
         )
+        update_fields = dict(fields)
+        if db.engine.dialect.name == 'mysql':
+            # LAST_INSERT_ID(id) makes lastrowid the id of the updated row, not only of an inserted one
+            update_fields['id'] = db.func.last_insert_id(ConversationSummary.id)
+        result = db.session.execute(on_conflict_update(statement, ['user_id', 'session_id'], update_fields))
+        if new_topics:
+            record_topic_interest(user_id, new_topics, now)
+        db.session.commit()
+        user_context_cache.invalidate(user_id)
         
-        try:
-            db.session.add(conversation_summary)
-            db.session.commit()
-            return jsonify({
-                'message': 'Conversation summary saved successfully',
-                'summary': conversation_summary.to_dict()
-            }), 201
-        except Exception as e:
-            db.session.rollback()
-            return jsonify({'error': str(e)}), 500
+        conversation_summary = ConversationSummary.query.filter_by(
+            user_id=user_id,
+            session_id=data['session_id']
+        ).first()
+        # A different row id than the one read above means the upsert inserted. Neither the
+        # affected row count (CLIENT_FOUND_ROWS reports 1 for an unchanged update) nor
+        # whole-second timestamps can tell an insert from an update
+        if db.engine.dialect.name == 'mysql':
+            saved_id = result.lastrowid
+        else:
+            saved_id = conversation_summary.id
+        created = saved_id != existing_id
+        
+        return jsonify({
+            'message': f"Conversation summary {'saved' if created else 'updated'} successfully",
+            'summary': conversation_summary.to_dict()
+        }), 201 if created else 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/chat/summary/<session_id>', methods=['GET'])
 def get_conversation_summary(session_id):
@@ -1646,6 +3872,8 @@ def create_report():
         'report': report.to_dict()
     }), 201
 
+REPORT_LIST_MAX_LIMIT = 100
+
 @app.route('/api/reports', methods=['GET'])
 def get_reports():
     if 'user_id' not in session:
@@ -1655,14 +3883,37 @@ def get_reports():
     if not user:
         return jsonify({'error': 'User not found'}), 404
     
+    # Reporter and resolver names come from the same query instead of two lookups per report
+    query = Report.query.options(joinedload(Report.user), joinedload(Report.resolver))
+    
     # Admin can see all reports, regular users only see their own
-    if user.is_admin:
-        reports = Report.query.order_by(Report.created_at.desc()).all()
+    if not user.is_admin:
+        query = query.filter(Report.user_id == user.id)
+    
+    for field in ('status', 'category', 'priority'):
+        value = request.args.get(field)
+        if value:
+            query = query.filter(getattr(Report, field) == value)
+    
+    # Pagination is opt-in: limit and/or after switch to keyset pages
+    next_cursor = None
+    if 'limit' in request.args or 'after' in request.args:
+        try:
+            limit = min(max(int(request.args.get('limit', 20)), 1), REPORT_LIST_MAX_LIMIT)
+        except ValueError:
+            return jsonify({'error': 'limit must be an integer'}), 400
+        try:
+            reports, next_cursor = paginate_keyset(
+                query, Report.created_at, Report.id, limit, request.args.get('after')
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
     else:
-        reports = Report.query.filter_by(user_id=session['user_id']).order_by(Report.created_at.desc()).all()
+        reports = query.order_by(Report.created_at.desc(), Report.id.desc()).all()
     
     return jsonify({
-        'reports': [report.to_dict() for report in reports]
+        'reports': [report.to_dict() for report in reports],
+        'next_cursor': next_cursor
     }), 200
 
 @app.route('/api/reports/recent', methods=['GET'])
@@ -1685,6 +3936,7 @@ def get_recent_reports():
         seven_days_ago = datetime.utcnow() - timedelta(days=7)
         
         reports = Report.query.join(User, Report.user_id == User.id)\
+            .options(contains_eager(Report.user), joinedload(Report.resolver))\
             .filter(Report.created_at >= seven_days_ago)\
             .order_by(Report.created_at.desc())\
             .limit(10).all()
@@ -1778,35 +4030,41 @@ def get_report_stats():
         return jsonify({'error': 'Not authenticated'}), 401
     
     user = User.query.get(session['user_id'])
-    if not user.is_admin:
+    if not user or not user.is_admin:
         return jsonify({'error': 'Access denied'}), 403
     
-    # Get report statistics
-    total_reports = Report.query.count()
-    pending_reports = Report.query.filter_by(status='pending').count()
-    in_progress_reports = Report.query.filter_by(status='in_progress').count()
-    resolved_reports = Report.query.filter_by(status='resolved').count()
-    
-    # Get reports by category
-    category_stats = db.session.query(
+    return jsonify(stats_cache.get_or_build('reports', build_report_stats)), 200
+
+def build_report_stats():
+    """Report totals, category and priority breakdowns from one grouped scan"""
+    rows = db.session.query(
         Report.category,
-        db.func.count(Report.id).label('count')
-    ).group_by(Report.category).all()
-    
-    # Get reports by priority
-    priority_stats = db.session.query(
         Report.priority,
-        db.func.count(Report.id).label('count')
-    ).group_by(Report.priority).all()
-    
-    return jsonify({
-        'total_reports': total_reports,
-        'pending_reports': pending_reports,
-        'in_progress_reports': in_progress_reports,
-        'resolved_reports': resolved_reports,
-        'category_stats': [{'category': cat, 'count': count} for cat, count in category_stats],
-        'priority_stats': [{'priority': pri, 'count': count} for pri, count in priority_stats]
-    }), 200
+        db.func.count(Report.id),
+        count_where(Report.status == 'pending'),
+        count_where(Report.status == 'in_progress'),
+        count_where(Report.status == 'resolved')
+    ).group_by(Report.category, Report.priority).all()
+    
+    totals = {'total': 0, 'pending': 0, 'in_progress': 0, 'resolved': 0}
+    category_counts = {}
+    priority_counts = {}
+    for category, priority, count, pending, in_progress, resolved in rows:
+        totals['total'] += count
+        totals['pending'] += int(pending or 0)
+        totals['in_progress'] += int(in_progress or 0)
+        totals['resolved'] += int(resolved or 0)
+        category_counts[category] = category_counts.get(category, 0) + count
+        priority_counts[priority] = priority_counts.get(priority, 0) + count
+    
+    return {
+        'total_reports': totals['total'],
+        'pending_reports': totals['pending'],
+        'in_progress_reports': totals['in_progress'],
+        'resolved_reports': totals['resolved'],
+        'category_stats': [{'category': cat, 'count': count} for cat, count in category_counts.items()],
+        'priority_stats': [{'priority': pri, 'count': count} for pri, count in priority_counts.items()]
+    }
 
 
 
@@ -1835,15 +4093,6 @@ def get_all_policies_admin():
         
         query = Policy.query
         
-        # Apply search filter
-        if search:
-            query = query.filter(
-                db.or_(
-                    Policy.title.ilike(f'%{search}%'),
-                    Policy.description.ilike(f'%{search}%')
-                )
-            )
-        
         # Apply category filter
         if category_filter:
             query = query.filter(Policy.category == category_filter)
@@ -1852,13 +4101,17 @@ def get_all_policies_admin():
         if status_filter:
             query = query.filter(Policy.status == status_filter)
         
-        # Paginate results
-        policies = query.order_by(Policy.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Search results are ordered by relevance, otherwise newest first
+        if search.strip():
+            policy_items, total, pages = search_indexes[Policy].search_page(query, search, page, per_page)
+        else:
+            policies = query.order_by(Policy.created_at.desc()).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            policy_items, total, pages = policies.items, policies.total, policies.pages
         
         policies_data = []
-        for policy in policies.items:
+        for policy in policy_items:
             policies_data.append({
                 'id': policy.id,
                 'title': policy.title,
@@ -1873,8 +4126,8 @@ def get_all_policies_admin():
         
         return jsonify({
             'policies': policies_data,
-            'total': policies.total,
-            'pages': policies.pages,
+            'total': total,
+            'pages': pages,
             'current_page': page,
             'per_page': per_page
         })
@@ -1884,29 +4137,28 @@ def get_all_policies_admin():
 @app.route('/api/admin/policies/stats', methods=['GET'])
 def get_policies_stats():
     try:
-        total_policies = Policy.query.count()
-        draft_policies = Policy.query.filter_by(status='draft').count()
-        approved_policies = Policy.query.filter_by(status='approved').count()
-        rejected_policies = Policy.query.filter_by(status='rejected').count()
-        
-        # Policies by category
-        category_stats = db.session.query(
-            Policy.category,
-            db.func.count(Policy.id).label('count')
-        ).group_by(Policy.category).all()
-        
-        category_data = [{'category': cat, 'count': count} for cat, count in category_stats]
-        
-        return jsonify({
-            'total_policies': total_policies,
-            'draft_policies': draft_policies,
-            'approved_policies': approved_policies,
-            'rejected_policies': rejected_policies,
-            'category_breakdown': category_data
-        })
+        return jsonify(stats_cache.get_or_build('policies', build_policies_stats))
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def build_policies_stats():
+    """Policy status counts and category breakdown from one grouped scan"""
+    category_stats = db.session.query(
+        Policy.category,
+        db.func.count(Policy.id),
+        count_where(Policy.status == 'draft'),
+        count_where(Policy.status == 'approved'),
+        count_where(Policy.status == 'rejected')
+    ).group_by(Policy.category).all()
+    
+    return {
+        'total_policies': sum(count for _, count, _, _, _ in category_stats),
+        'draft_policies': sum(int(draft or 0) for _, _, draft, _, _ in category_stats),
+        'approved_policies': sum(int(approved or 0) for _, _, _, approved, _ in category_stats),
+        'rejected_policies': sum(int(rejected or 0) for _, _, _, _, rejected in category_stats),
+        'category_breakdown': [{'category': cat, 'count': count} for cat, count, _, _, _ in category_stats]
+    }
+
 # Polling Management Endpoints
 @app.route('/api/admin/polls', methods=['GET'])
 @admin_required
@@ -1920,15 +4172,6 @@ def get_all_polls_admin():
         
         query = Polling.query
         
-        # Apply search filter
-        if search:
-            query = query.filter(
-                db.or_(
-                    Polling.title.ilike(f'%{search}%'),
-                    Polling.description.ilike(f'%{search}%')
-                )
-            )
-        
         # Apply category filter
         if category_filter:
             query = query.filter(Polling.category == category_filter)
@@ -1937,16 +4180,17 @@ def get_all_polls_admin():
         if status_filter:
             query = query.filter(Polling.status == status_filter)
         
-        # Paginate results
-        polls = query.order_by(Polling.created_at.desc()).paginate(
-            page=page, per_page=per_page, error_out=False
-        )
+        # Search results are ordered by relevance, otherwise newest first
+        if search.strip():
+            poll_items, total, pages = search_indexes[Polling].search_page(query, search, page, per_page)
+        else:
+            polls = query.order_by(Polling.created_at.desc()).paginate(
+                page=page, per_page=per_page, error_out=False
+            )
+            poll_items, total, pages = polls.items, polls.total, polls.pages
         
         polls_data = []
-        for poll in polls.items:
-            # Get vote count for each poll
-            vote_count = PollingVote.query.filter_by(polling_id=poll.id).count()
-            
+        for poll in poll_items:
             polls_data.append({
                 'id': poll.id,
                 'title': poll.title,
@@ -1958,14 +4202,14 @@ def get_all_polls_admin():
                 'end_date': poll.end_date.isoformat() if poll.end_date else None,
                 'created_at': poll.created_at.isoformat() if poll.created_at else None,
                 'creator': poll.creator.full_name if poll.creator else None,
-                'vote_count': vote_count,
+                'vote_count': poll.total_votes or 0,
                 'options_count': len(poll.options)
             })
         
         return jsonify({
             'polls': polls_data,
-            'total': polls.total,
-            'pages': polls.pages,
+            'total': total,
+            'pages': pages,
             'current_page': page,
             'per_page': per_page
         })
@@ -1975,67 +4219,124 @@ def get_all_polls_admin():
 @app.route('/api/admin/polls/stats', methods=['GET'])
 def get_polls_stats():
     try:
-        total_polls = Polling.query.count()
-        active_polls = Polling.query.filter_by(status='active').count()
-        ended_polls = Polling.query.filter_by(status='ended').count()
-        total_votes = PollingVote.query.count()
-        
-        # Polls by category
-        category_stats = db.session.query(
-            Polling.category,
-            db.func.count(Polling.id).label('count')
-        ).group_by(Polling.category).all()
-        
-        category_data = [{'category': cat, 'count': count} for cat, count in category_stats]
-        
-        # Most voted polls
-        top_polls = db.session.query(
-            Polling.id,
-            Polling.title,
-            db.func.count(PollingVote.id).label('vote_count')
-        ).join(PollingVote).group_by(Polling.id).order_by(
-            db.func.count(PollingVote.id).desc()
-        ).limit(5).all()
-        
-        top_polls_data = [{
+        return jsonify(stats_cache.get_or_build('polls', build_polls_stats))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def build_polls_stats():
+    """Poll status counts, vote total and category breakdown from one grouped scan"""
+    category_stats = db.session.query(
+        Polling.category,
+        db.func.count(Polling.id),
+        count_where(Polling.status == 'active'),
+        count_where(Polling.status == 'ended'),
+        db.func.sum(Polling.total_votes)
+    ).group_by(Polling.category).all()
+    
+    # Most voted polls
+    top_polls = db.session.query(
+        Polling.id,
+        Polling.title,
+        Polling.total_votes
+    ).filter(Polling.total_votes > 0).order_by(
+        Polling.total_votes.desc()
+    ).limit(5).all()
+    
+    return {
+        'total_polls': sum(count for _, count, _, _, _ in category_stats),
+        'active_polls': sum(int(active or 0) for _, _, active, _, _ in category_stats),
+        'ended_polls': sum(int(ended or 0) for _, _, _, ended, _ in category_stats),
+        'total_votes': sum(int(votes or 0) for _, _, _, _, votes in category_stats),
+        'category_breakdown': [{'category': cat, 'count': count} for cat, count, _, _, _ in category_stats],
+        'top_polls': [{
             'id': poll_id,
             'title': title,
             'vote_count': vote_count
         } for poll_id, title, vote_count in top_polls]
-        
-        return jsonify({
-            'total_polls': total_polls,
-            'active_polls': active_polls,
-            'ended_polls': ended_polls,
-            'total_votes': total_votes,
-            'category_breakdown': category_data,
-            'top_polls': top_polls_data
+    }
+
+def build_poll_results(poll):
+    """Tally a poll's votes per option with a single grouped query"""
+    option_counts = db.session.query(
+        PollingOption.id,
+        PollingOption.option_text,
+        db.func.count(PollingVote.id).label('vote_count')
+    ).outerjoin(
+        PollingVote, PollingVote.option_id == PollingOption.id
+    ).filter(
+        PollingOption.polling_id == poll.id
+    ).group_by(
+        PollingOption.id, PollingOption.option_text
+    ).order_by(PollingOption.id).all()
+    
+    return {
+        'poll': {
+            'id': poll.id,
+            'title': poll.title,
+            'description': poll.description,
+            'status': poll.status
+        },
+        'options': [{
+            'id': option_id,
+            'option_text': option_text,
+            'vote_count': vote_count
+        } for option_id, option_text, vote_count in option_counts]
+    }
+
+POLL_RESULTS_GROUP_BY = ('dapil', 'kecamatan')
+
+def build_poll_region_breakdown(poll_id, group_by):
+    """Per-region option tallies read from polling_vote_rollup"""
+    region_column = getattr(PollingVoteRollup, group_by)
+    rows = db.session.query(
+        region_column,
+        PollingVoteRollup.option_id,
+        db.func.sum(PollingVoteRollup.vote_count)
+    ).filter(
+        PollingVoteRollup.polling_id == poll_id
+    ).group_by(region_column, PollingVoteRollup.option_id).all()
+    
+    regions = {}
+    for region, option_id, vote_count in rows:
+        region_data = regions.setdefault(region, {
+            group_by: region or None,
+            'total_votes': 0,
+            'options': []
         })
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        region_data['options'].append({'id': option_id, 'vote_count': int(vote_count)})
+        region_data['total_votes'] += int(vote_count)
+    
+    return sorted(regions.values(), key=lambda region_data: region_data['total_votes'], reverse=True)
 
 @app.route('/api/admin/polls/<int:poll_id>/results', methods=['GET'])
 @admin_required
 def get_poll_results(poll_id):
     try:
-        poll = Polling.query.get_or_404(poll_id)
+        group_by = request.args.get('group_by')
+        if group_by and group_by not in POLL_RESULTS_GROUP_BY:
+            return jsonify({'error': f'group_by must be one of: {", ".join(POLL_RESULTS_GROUP_BY)}'}), 400
+        
+        results = poll_results_cache.get(poll_id)
+        if results is None:
+            generation = poll_results_cache.generation(poll_id)
+            poll = Polling.query.get_or_404(poll_id)
+            if poll.status != 'active' and poll.results_snapshot:
+                # Closed polls are served from their frozen results
+                results = {
+                    'poll': {
+                        'id': poll.id,
+                        'title': poll.title,
+                        'description': poll.description,
+                        'status': poll.status
+                    },
+                    'options': json.loads(poll.results_snapshot)['options']
+                }
+            else:
+                results = build_poll_results(poll)
+            poll_results_cache.set(poll_id, results, generation)
         
-        # Get options with vote counts
-        options_data = []
-        total_votes = 0
-        
-        for option in poll.options:
-            vote_count = PollingVote.query.filter_by(
-                polling_id=poll.id,
-                option_id=option.id
-            ).count()
-            
-            options_data.append({
-                'id': option.id,
-                'option_text': option.option_text,
-                'vote_count': vote_count
-            })
-            total_votes += vote_count
+        options_data = results['options']
+        total_votes = sum(option['vote_count'] for option in options_data)
         
         # Calculate percentages
         for option in options_data:
@@ -2044,39 +4345,34 @@ def get_poll_results(poll_id):
             else:
                 option['percentage'] = 0
         
-        return jsonify({
-            'poll': {
-                'id': poll.id,
-                'title': poll.title,
-                'description': poll.description,
-                'status': poll.status,
-                'total_votes': total_votes
-            },
+        results['poll']['total_votes'] = total_votes
+        
+        response_data = {
+            'poll': results['poll'],
             'options': options_data
-        })
+        }
+        if group_by:
+            response_data['group_by'] = group_by
+            response_data['breakdown'] = build_poll_region_breakdown(poll_id, group_by)
+        
+        return jsonify(response_data)
     except Exception as e:
          return jsonify({'error': str(e)}), 500
 
-
-
-
-
 @app.route('/api/admin/reports/poll-performance', methods=['GET'])
 @admin_required
 def get_poll_performance():
     try:
         from datetime import datetime, timedelta
-        from sqlalchemy import func
         
         # Get top performing polls by vote count
         top_polls = db.session.query(
             Polling.id,
             Polling.title,
             Polling.category,
-            func.count(PollingVote.id).label('vote_count')
-        ).join(PollingVote, Polling.id == PollingVote.polling_id)\
-         .group_by(Polling.id, Polling.title, Polling.category)\
-         .order_by(func.count(PollingVote.id).desc())\
+            Polling.total_votes.label('vote_count')
+        ).filter(Polling.total_votes > 0)\
+         .order_by(Polling.total_votes.desc())\
          .limit(10).all()
         
         performance_data = []
@@ -2105,9 +4401,8 @@ def get_category_stats():
         category_stats = db.session.query(
             Polling.category,
             func.count(Polling.id).label('poll_count'),
-            func.count(PollingVote.id).label('vote_count')
-        ).outerjoin(PollingVote, Polling.id == PollingVote.polling_id)\
-         .group_by(Polling.category)\
+            func.sum(Polling.total_votes).label('vote_count')
+        ).group_by(Polling.category)\
          .order_by(func.count(Polling.id).desc()).all()
         
         stats_data = []
@@ -2238,7 +4533,7 @@ def get_dashboard_quick_stats():
         total_users = User.query.count()
         active_polls = Polling.query.filter_by(status='active').count()
         total_policies = Policy.query.count()
-        chatbot_interactions = ChatHistory.query.with_entities(ChatHistory.session_id).distinct().count()
+        chatbot_interactions = ChatSession.query.count()
         
         # Format data sesuai dengan yang diharapkan frontend
         stats = {
@@ -2281,6 +4576,7 @@ def get_dashboard_quick_stats():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/dapil/by-kecamatan/<kecamatan>', methods=['GET'])
+@conditional_response(Dapil)
 def get_dapil_by_kecamatan(kecamatan):
     """Get dapil information by kecamatan"""
     try:
@@ -2294,6 +4590,7 @@ def get_dapil_by_kecamatan(kecamatan):
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/officials/by-dapil/<dapil_name>', methods=['GET'])
+@conditional_response(Officials)
 def get_officials_by_dapil(dapil_name):
     """Get all officials by dapil name"""
     try:
@@ -2379,6 +4676,7 @@ def check_official_status(official_name):
 
 # Get all officials with smartpol status
 @app.route('/api/officials/smartpol-members', methods=['GET'])
+@conditional_response(Officials)
 def get_smartpol_members():
     try:
         # Get all officials who joined smartpol
@@ -2529,6 +4827,7 @@ def get_polling_publik_stats():
 
 # Event Pendidikan Politik Endpoints
 @app.route('/api/events', methods=['GET'])
+@conditional_response(EventPendidikanPolitik)
 def get_events():
     try:
         events = EventPendidikanPolitik.query.filter_by(is_active=True).order_by(EventPendidikanPolitik.event_date.asc()).all()
@@ -2631,6 +4930,80 @@ with app.app_context():
             print(f"Error adding sample events: {e}")
 
 # Chatbot-specific endpoints for user data access
+NIK_PREFIX_KECAMATAN = {
+    '357301': 'Klojen',
+    '357302': 'Blimbing',
+    '357303': 'Kedungkandang',
+    '357304': 'Sukun',
+    '357305': 'Lowokwaru'
+}
+
+def build_user_context(user):
+    """Chatbot personalization context for a user, read with a handful of indexed queries"""
+    # dapil/kecamatan are stored on the user at NIK verification; only older
+    # accounts fall back to matching the NIK prefix against the dapil table
+    user_dapil = user.dapil
+    user_kecamatan = user.kecamatan
+    if user.nik and user.nik_verified and not user_dapil:
+        user_dapil = validate_nik_by_dapil(user.nik)
+    if user.nik and user.nik_verified and not user_kecamatan:
+        user_kecamatan = NIK_PREFIX_KECAMATAN.get(user.nik[:6], 'Unknown')
+    
+    dapil_info = None
+    officials = []
+    if user_dapil:
+        dapil = Dapil.query.filter_by(name=user_dapil).first()
+        if dapil:
+            dapil_info = {
+                'name': dapil.name,
+                'description': dapil.description,
+                'province': dapil.province
+            }
+        officials = Officials.query.filter_by(electoral_district=user_dapil).all()
+    
+    recent_chats = ChatHistory.query.filter_by(user_id=user.id).order_by(
+        ChatHistory.timestamp.desc(), ChatHistory.id.desc()
+    ).limit(10).all()
+    
+    # chat_session counts include archived sessions
+    chat_history_count = db.session.query(
+        db.func.coalesce(db.func.sum(ChatSession.message_count), 0)
+    ).filter(ChatSession.user_id == user.id).scalar()
+    
+    user_votes = db.session.query(db.func.count(PollingVote.id)).filter(PollingVote.user_id == user.id).scalar()
+    
+    topic_profile = db.session.get(UserTopicProfile, user.id)
+    
+    return {
+        'user': {
+            'id': user.id,
+            'username': user.username,
+            'full_name': user.full_name,
+            'email': user.email,
+            'role': user.role,
+            'nik': user.nik,
+            'nik_verified': user.nik_verified,
+            'verified': user.nik_verified,
+            'kecamatan': user_kecamatan,
+            'dapil': user_dapil,
+            'created_at': user.created_at.isoformat() if user.created_at else None
+        },
+        'location': {
+            'dapil': user_dapil,
+            'kecamatan': user_kecamatan
+        },
+        'dapil_info': dapil_info,
+        'officials': [official.to_dict() for official in officials],
+        'chat_history_count': int(chat_history_count),
+        'engagement': {
+            'total_chats': int(chat_history_count),
+            'poll_votes': user_votes,
+            'verification_status': user.nik_verified
+        },
+        'recent_chat_topics': [chat.message[:100] for chat in recent_chats if chat.is_user][:5],
+        'topic_interests': topic_profile.top_topics(TOPIC_PROFILE_DEFAULT_LIMIT) if topic_profile else []
+    }
+
 @app.route('/api/chatbot/user-context', methods=['GET'])
 def get_user_context_for_chatbot():
     """Get comprehensive user context for chatbot personalization"""
@@ -2638,68 +5011,17 @@ def get_user_context_for_chatbot():
         if 'user_id' not in session:
             return jsonify({'error': 'Not authenticated'}), 401
         
-        user = User.query.get(session['user_id'])
-        if not user:
-            return jsonify({'error': 'User not found'}), 404
-        
-        # Get user's dapil information
-        user_dapil = None
-        user_kecamatan = None
-        
-        if user.nik and user.verified:
-            # Find user's dapil based on NIK
-            dapil_result = validate_nik_by_dapil(user.nik)
-            if dapil_result:
-                user_dapil = dapil_result
-                # Get kecamatan from dapil data
-                dapil_data = Dapil.query.filter_by(name=dapil_result).first()
-                if dapil_data and dapil_data.kecamatan_list:
-                    # Extract kecamatan from NIK prefix
-                    nik_prefix = user.nik[:6]
-                    kecamatan_mapping = {
-                        '357301': 'Klojen',
-                        '357302': 'Blimbing', 
-                        '357303': 'Kedungkandang',
-                        '357304': 'Sukun',
-                        '357305': 'Lowokwaru'
-                    }
-                    user_kecamatan = kecamatan_mapping.get(nik_prefix, 'Unknown')
-        
-        # Get user's officials
-        officials = []
-        if user_dapil:
-            officials = Officials.query.filter_by(electoral_district=user_dapil).all()
-        
-        # Get recent chat history for context
-        recent_chats = ChatHistory.query.filter_by(user_id=user.id)\
-            .order_by(ChatHistory.timestamp.desc()).limit(10).all()
-        
-        # Get user's polling participation
-        user_votes = PollVote.query.filter_by(user_id=user.id).count()
-        
-        return jsonify({
-            'user': {
-                'id': user.id,
-                'username': user.username,
-                'full_name': user.full_name,
-                'email': user.email,
-                'role': user.role,
-                'nik': user.nik,
-                'verified': user.verified,
-                'created_at': user.created_at.isoformat() if user.created_at else None
-            },
-            'location': {
-                'dapil': user_dapil,
-                'kecamatan': user_kecamatan
-            },
-            'officials': [official.to_dict() for official in officials],
-            'engagement': {
-                'total_chats': len(recent_chats),
-                'poll_votes': user_votes,
-                'verification_status': user.verified
-            },
-            'recent_chat_topics': [chat.message[:100] for chat in recent_chats if chat.is_user][:5]
-        })
+        user_id = session['user_id']
+        context = user_context_cache.get(user_id)
+        if context is None:
+            generation = user_context_cache.generation(user_id)
+            user = User.query.get(user_id)
+            if not user:
+                return jsonify({'error': 'User not found'}), 404
+            context = build_user_context(user)
+            user_context_cache.set(user_id, context, generation)
+        
+        return jsonify(context)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -2738,5 +5060,74 @@ def handle_user_preferences():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# CLI commands
+@app.cli.command('reconcile-votes')
+@click.option('--poll-id', 'poll_ids', type=int, multiple=True, help='Only reconcile the given poll(s)')
+@click.option('--include-buffered', is_flag=True, help='Also rebuild buffered polls (stop the web workers first)')
+def reconcile_votes_command(poll_ids, include_buffered):
+    """Rebuild denormalized poll vote counters from polling_vote."""
+    repaired = reconcile_vote_counters(list(poll_ids) if poll_ids else None, include_buffered)
+    db.session.commit()
+    click.echo(f'Reconciled vote counters, {repaired} row(s) repaired')
+
+@app.cli.command('rebuild-vote-rollup')
+@click.option('--poll-id', 'poll_ids', type=int, multiple=True, help='Only rebuild the given poll(s)')
+def rebuild_vote_rollup_command(poll_ids):
+    """Rebuild the per-dapil/kecamatan vote rollup from polling_vote."""
+    rows = rebuild_vote_rollup(list(poll_ids) if poll_ids else None)
+    db.session.commit()
+    click.echo(f'Rebuilt vote rollup, {rows} row(s) written')
+
+@app.cli.command('rebuild-chat-sessions')
+@click.option('--user-id', 'user_ids', type=int, multiple=True, help='Only rebuild the given user(s)')
+def rebuild_chat_sessions_command(user_ids):
+    """Rebuild the chat_session sidebar table from chat_history."""
+    rows = rebuild_chat_sessions(list(user_ids) if user_ids else None)
+    db.session.commit()
+    click.echo(f'Rebuilt chat sessions, {rows} row(s) written')
+
+@app.cli.command('archive-chat-sessions')
+@click.option('--idle-days', type=int, default=None, help='Idle threshold in days (default CHAT_ARCHIVE_IDLE_DAYS)')
+@click.option('--max-sessions', type=int, default=None, help='Stop after archiving this many sessions')
+def archive_chat_sessions_command(idle_days, max_sessions):
+    """Move idle chat sessions from chat_history into compressed chat_archive rows (cron friendly)."""
+    sessions_archived, messages_archived = archive_idle_chat_sessions(idle_days, max_sessions)
+    click.echo(f'Archived {sessions_archived} chat session(s), {messages_archived} message(s)')
+
+@app.cli.command('rebuild-topic-profiles')
+@click.option('--user-id', 'user_ids', type=int, multiple=True, help='Only rebuild the given user(s)')
+def rebuild_topic_profiles_command(user_ids):
+    """Rebuild per-user topic profiles from saved conversation summaries."""
+    profiles = {}
+    summaries = db.select(
+        ConversationSummary.user_id, ConversationSummary.topics, ConversationSummary.updated_at
+    ).order_by(ConversationSummary.user_id, ConversationSummary.updated_at)
+    if user_ids:
+        summaries = summaries.where(ConversationSummary.user_id.in_(user_ids))
+    
+    for user_id, topics, updated_at in db.session.execute(summaries.execution_options(yield_per=1000)):
+        topic_weights = parse_summary_topics(topics)
+        if not topic_weights:
+            continue
+        profile = profiles.get(user_id)
+        if profile is None:
+            profile = profiles[user_id] = UserTopicProfile(user_id=user_id, topics='{}', decayed_at=updated_at)
+        profile.add_topics(topic_weights, updated_at)
+    
+    delete_profiles = db.delete(UserTopicProfile)
+    if user_ids:
+        delete_profiles = delete_profiles.where(UserTopicProfile.user_id.in_(user_ids))
+    db.session.execute(delete_profiles.execution_options(synchronize_session=False))
+    db.session.add_all(profiles.values())
+    db.session.commit()
+    click.echo(f'Rebuilt topic profiles for {len(profiles)} user(s)')
+
+@app.cli.command('close-expired-polls')
+def close_expired_polls_command():
+    """Close active polls past their end_date and freeze their results (cron friendly)."""
+    closed, frozen = close_expired_polls()
+    db.session.commit()
+    click.echo(f'Closed {closed} expired poll(s), froze results of {frozen}')
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""Add chat_archive table
+
+Revision ID: 0a9c4e7b5d28
+Revises: f2a6d8e4b731
+Create Date: 2026-10-18 14:32:09.418273
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision = '0a9c4e7b5d28'
+down_revision = 'f2a6d8e4b731'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chat_archive',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.String(length=255), nullable=False),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.Column('first_at', sa.DateTime(), nullable=False),
+    sa.Column('last_at', sa.DateTime(), nullable=False),
+    sa.Column('payload', sa.LargeBinary().with_variant(mysql.LONGBLOB(), 'mysql'), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'session_id', name='uq_chat_archive_user_session')
+    )
+
+
+def downgrade():
+    op.drop_table('chat_archive')
@@ -0,0 +1,37 @@
+"""Add unique (user_id, session_id) key to conversation_summary
+
+Revision ID: 1b7e3f9a6c52
+Revises: 0a9c4e7b5d28
+Create Date: 2026-10-18 15:02:44.931806
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '1b7e3f9a6c52'
+down_revision = '0a9c4e7b5d28'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep only the most recently updated summary of each session
+    op.execute(
+        "DELETE FROM conversation_summary WHERE id NOT IN ("
+        "SELECT keep_id FROM ("
+        "SELECT (SELECT newest.id FROM conversation_summary newest "
+        "WHERE newest.user_id = cs.user_id AND newest.session_id = cs.session_id "
+        "ORDER BY newest.updated_at DESC, newest.id DESC LIMIT 1) AS keep_id "
+        "FROM conversation_summary cs GROUP BY cs.user_id, cs.session_id"
+        ") AS keepers)"
+    )
+
+    with op.batch_alter_table('conversation_summary', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_conversation_summary_user_session', ['user_id', 'session_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('conversation_summary', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_conversation_summary_user_session', type_='unique')
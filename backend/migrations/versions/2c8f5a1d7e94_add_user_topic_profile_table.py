@@ -0,0 +1,31 @@
+"""Add user_topic_profile table
+
+Revision ID: 2c8f5a1d7e94
+Revises: 1b7e3f9a6c52
+Create Date: 2026-10-18 15:38:26.270415
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2c8f5a1d7e94'
+down_revision = '1b7e3f9a6c52'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('user_topic_profile',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('topics', sa.Text(), nullable=False),
+    sa.Column('decayed_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('user_topic_profile')
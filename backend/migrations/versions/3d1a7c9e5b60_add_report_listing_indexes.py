@@ -0,0 +1,30 @@
+"""Add listing indexes to report table
+
+Revision ID: 3d1a7c9e5b60
+Revises: 2c8f5a1d7e94
+Create Date: 2026-10-18 16:04:51.583127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3d1a7c9e5b60'
+down_revision = '2c8f5a1d7e94'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('report', schema=None) as batch_op:
+        batch_op.create_index('ix_report_created_at_id', ['created_at', 'id'], unique=False)
+        batch_op.create_index('ix_report_status_category_created_at_id', ['status', 'category', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_report_user_created_at_id', ['user_id', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('report', schema=None) as batch_op:
+        batch_op.drop_index('ix_report_user_created_at_id')
+        batch_op.drop_index('ix_report_status_category_created_at_id')
+        batch_op.drop_index('ix_report_created_at_id')
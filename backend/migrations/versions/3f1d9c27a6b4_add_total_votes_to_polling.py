@@ -0,0 +1,32 @@
+"""Add total_votes counter to polling table
+
+Revision ID: 3f1d9c27a6b4
+Revises: cc8b1d4c684c
+Create Date: 2026-10-18 09:12:41.203114
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1d9c27a6b4'
+down_revision = 'cc8b1d4c684c'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('polling', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('total_votes', sa.Integer(), nullable=True, server_default='0'))
+
+    # Backfill the counter from existing votes
+    op.execute(
+        'UPDATE polling SET total_votes = '
+        '(SELECT COUNT(polling_vote.id) FROM polling_vote WHERE polling_vote.polling_id = polling.id)'
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('polling', schema=None) as batch_op:
+        batch_op.drop_column('total_votes')
@@ -0,0 +1,30 @@
+"""Add single-filter listing indexes to report table
+
+Revision ID: 4e2b8d0f6a17
+Revises: 3d1a7c9e5b60
+Create Date: 2026-10-18 18:22:40.915362
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '4e2b8d0f6a17'
+down_revision = '3d1a7c9e5b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('report', schema=None) as batch_op:
+        batch_op.create_index('ix_report_status_created_at_id', ['status', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_report_category_created_at_id', ['category', 'created_at', 'id'], unique=False)
+        batch_op.create_index('ix_report_priority_created_at_id', ['priority', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('report', schema=None) as batch_op:
+        batch_op.drop_index('ix_report_priority_created_at_id')
+        batch_op.drop_index('ix_report_category_created_at_id')
+        batch_op.drop_index('ix_report_status_created_at_id')
@@ -0,0 +1,26 @@
+"""Add (created_at, id) index to polling table
+
+Revision ID: 5a7e2b90c4d1
+Revises: 3f1d9c27a6b4
+Create Date: 2026-10-18 10:03:17.482906
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a7e2b90c4d1'
+down_revision = '3f1d9c27a6b4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('polling', schema=None) as batch_op:
+        batch_op.create_index('ix_polling_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('polling', schema=None) as batch_op:
+        batch_op.drop_index('ix_polling_created_at_id')
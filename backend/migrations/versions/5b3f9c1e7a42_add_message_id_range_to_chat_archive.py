@@ -0,0 +1,45 @@
+"""Add message id range to chat_archive
+
+Revision ID: 5b3f9c1e7a42
+Revises: 4e2b8d0f6a17
+Create Date: 2026-10-18 19:41:12.508317
+
+"""
+import json
+import zlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5b3f9c1e7a42'
+down_revision = '4e2b8d0f6a17'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chat_archive', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('min_message_id', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('max_message_id', sa.Integer(), nullable=True))
+
+    # Backfill from the compressed payloads, one archive at a time
+    connection = op.get_bind()
+    archive_ids = [row[0] for row in connection.execute(sa.text('SELECT id FROM chat_archive'))]
+    for archive_id in archive_ids:
+        payload = connection.execute(
+            sa.text('SELECT payload FROM chat_archive WHERE id = :id'), {'id': archive_id}
+        ).scalar()
+        message_ids = [message['id'] for message in json.loads(zlib.decompress(payload).decode())]
+        if message_ids:
+            connection.execute(
+                sa.text('UPDATE chat_archive SET min_message_id = :min_id, max_message_id = :max_id WHERE id = :id'),
+                {'min_id': min(message_ids), 'max_id': max(message_ids), 'id': archive_id}
+            )
+
+
+def downgrade():
+    with op.batch_alter_table('chat_archive', schema=None) as batch_op:
+        batch_op.drop_column('max_message_id')
+        batch_op.drop_column('min_message_id')
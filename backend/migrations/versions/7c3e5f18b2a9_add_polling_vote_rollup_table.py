@@ -0,0 +1,41 @@
+"""Add polling_vote_rollup table
+
+Revision ID: 7c3e5f18b2a9
+Revises: 5a7e2b90c4d1
+Create Date: 2026-10-18 10:41:52.917330
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c3e5f18b2a9'
+down_revision = '5a7e2b90c4d1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('polling_vote_rollup',
+    sa.Column('polling_id', sa.Integer(), nullable=False),
+    sa.Column('option_id', sa.Integer(), nullable=False),
+    sa.Column('dapil', sa.String(length=20), nullable=False),
+    sa.Column('kecamatan', sa.String(length=50), nullable=False),
+    sa.Column('vote_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['option_id'], ['polling_option.id'], ),
+    sa.ForeignKeyConstraint(['polling_id'], ['polling.id'], ),
+    sa.PrimaryKeyConstraint('polling_id', 'option_id', 'dapil', 'kecamatan')
+    )
+
+    # Backfill from existing votes
+    op.execute(
+        "INSERT INTO polling_vote_rollup (polling_id, option_id, dapil, kecamatan, vote_count) "
+        "SELECT pv.polling_id, pv.option_id, COALESCE(u.dapil, ''), COALESCE(u.kecamatan, ''), COUNT(pv.id) "
+        "FROM polling_vote pv JOIN user u ON u.id = pv.user_id "
+        "GROUP BY pv.polling_id, pv.option_id, COALESCE(u.dapil, ''), COALESCE(u.kecamatan, '')"
+    )
+
+
+def downgrade():
+    op.drop_table('polling_vote_rollup')
@@ -0,0 +1,28 @@
+"""Add results_snapshot column and status/end_date index to polling table
+
+Revision ID: 9e4b1a6d3c70
+Revises: 7c3e5f18b2a9
+Create Date: 2026-10-18 11:26:08.640271
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9e4b1a6d3c70'
+down_revision = '7c3e5f18b2a9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('polling', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('results_snapshot', sa.Text(), nullable=True))
+        batch_op.create_index('ix_polling_status_end_date', ['status', 'end_date'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('polling', schema=None) as batch_op:
+        batch_op.drop_index('ix_polling_status_end_date')
+        batch_op.drop_column('results_snapshot')
@@ -0,0 +1,33 @@
+"""Add FULLTEXT search indexes to policy and polling tables
+
+Revision ID: b2d8f4e61a35
+Revises: 9e4b1a6d3c70
+Create Date: 2026-10-18 12:08:44.115902
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b2d8f4e61a35'
+down_revision = '9e4b1a6d3c70'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # FULLTEXT is MySQL only; other databases use the in-process search index
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    op.create_index('ft_policy_title_description', 'policy', ['title', 'description'], unique=False, mysql_prefix='FULLTEXT')
+    op.create_index('ft_polling_title_description', 'polling', ['title', 'description'], unique=False, mysql_prefix='FULLTEXT')
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    op.drop_index('ft_polling_title_description', table_name='polling')
+    op.drop_index('ft_policy_title_description', table_name='policy')
@@ -0,0 +1,26 @@
+"""Add (created_at, id) index to policy table
+
+Revision ID: c6a0e3d57f12
+Revises: b2d8f4e61a35
+Create Date: 2026-10-18 12:47:30.559184
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c6a0e3d57f12'
+down_revision = 'b2d8f4e61a35'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('policy', schema=None) as batch_op:
+        batch_op.create_index('ix_policy_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('policy', schema=None) as batch_op:
+        batch_op.drop_index('ix_policy_created_at_id')
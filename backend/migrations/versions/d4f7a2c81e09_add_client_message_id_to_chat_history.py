@@ -0,0 +1,28 @@
+"""Add client_message_id to chat_history for idempotent batch saves
+
+Revision ID: d4f7a2c81e09
+Revises: c6a0e3d57f12
+Create Date: 2026-10-18 13:20:11.804512
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4f7a2c81e09'
+down_revision = 'c6a0e3d57f12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chat_history', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('client_message_id', sa.String(length=64), nullable=True))
+        batch_op.create_unique_constraint('uq_chat_history_user_client_message', ['user_id', 'client_message_id'])
+
+
+def downgrade():
+    with op.batch_alter_table('chat_history', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_chat_history_user_client_message', type_='unique')
+        batch_op.drop_column('client_message_id')
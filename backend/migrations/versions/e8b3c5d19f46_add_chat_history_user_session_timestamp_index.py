@@ -0,0 +1,26 @@
+"""Add (user_id, session_id, timestamp) index to chat_history table
+
+Revision ID: e8b3c5d19f46
+Revises: d4f7a2c81e09
+Create Date: 2026-10-18 13:41:52.117630
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b3c5d19f46'
+down_revision = 'd4f7a2c81e09'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('chat_history', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_history_user_session_timestamp', ['user_id', 'session_id', 'timestamp'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('chat_history', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_history_user_session_timestamp')
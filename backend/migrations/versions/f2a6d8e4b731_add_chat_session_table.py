@@ -0,0 +1,52 @@
+"""Add chat_session table
+
+Revision ID: f2a6d8e4b731
+Revises: e8b3c5d19f46
+Create Date: 2026-10-18 14:05:37.662019
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2a6d8e4b731'
+down_revision = 'e8b3c5d19f46'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('chat_session',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('session_id', sa.String(length=255), nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=True),
+    sa.Column('first_at', sa.DateTime(), nullable=False),
+    sa.Column('last_message_time', sa.DateTime(), nullable=False),
+    sa.Column('message_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'session_id', name='uq_chat_session_user_session')
+    )
+    with op.batch_alter_table('chat_session', schema=None) as batch_op:
+        batch_op.create_index('ix_chat_session_user_last_message', ['user_id', 'last_message_time', 'id'], unique=False)
+
+    # Backfill from existing chat history, titled by each session's first user message
+    op.execute(
+        "INSERT INTO chat_session (user_id, session_id, title, first_at, last_message_time, message_count) "
+        "SELECT ch.user_id, ch.session_id, "
+        "(SELECT SUBSTR(f.message, 1, 255) FROM chat_history f "
+        "WHERE f.user_id = ch.user_id AND f.session_id = ch.session_id AND f.is_user = 1 "
+        "ORDER BY f.timestamp, f.id LIMIT 1), "
+        "MIN(ch.timestamp), MAX(ch.timestamp), COUNT(ch.id) "
+        "FROM chat_history ch WHERE ch.session_id IS NOT NULL "
+        "GROUP BY ch.user_id, ch.session_id"
+    )
+
+
+def downgrade():
+    with op.batch_alter_table('chat_session', schema=None) as batch_op:
+        batch_op.drop_index('ix_chat_session_user_last_message')
+
+    op.drop_table('chat_session')
@@ -0,0 +1,288 @@
+"""Indonesian-aware text search helpers for SmartPol.
+
+Provides a tokenizer with Indonesian stop words, a light rule-based
+Indonesian stemmer (Nazief-Adriani style affix stripping without a root
+word dictionary) and a thread-safe in-memory inverted index ranked with
+BM25. Kept free of Flask/SQLAlchemy so it can be used from app.py and
+from scripts alike.
+"""
+import heapq
+import math
+import re
+import threading
+
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+
+STOP_WORDS = frozenset({
+    'ada', 'adalah', 'agar', 'akan', 'aku', 'anda', 'antara', 'apa', 'apabila', 'atas',
+    'atau', 'bagaimana', 'bagi', 'bahwa', 'banyak', 'beberapa', 'belum', 'bisa', 'boleh',
+    'dalam', 'dan', 'dapat', 'dari', 'daripada', 'demikian', 'dengan', 'di', 'dia',
+    'dimana', 'hal', 'hanya', 'harus', 'hingga', 'ia', 'ialah', 'ini', 'itu', 'jadi',
+    'jika', 'juga', 'kalau', 'kami', 'kamu', 'karena', 'ke', 'kemudian', 'kepada',
+    'ketika', 'kita', 'lagi', 'lain', 'lebih', 'maka', 'masih', 'mereka', 'namun',
+    'oleh', 'pada', 'para', 'per', 'pula', 'saat', 'saja', 'sama', 'sangat', 'saya',
+    'se', 'sebagai', 'sebelum', 'sedang', 'sehingga', 'sejak', 'selain', 'sementara',
+    'semua', 'serta', 'setelah', 'setiap', 'sudah', 'tanpa', 'telah', 'tentang',
+    'tersebut', 'tetapi', 'tidak', 'untuk', 'yaitu', 'yakni', 'yang',
+})
+
+PARTICLE_SUFFIXES = ('lah', 'kah', 'pun')
+POSSESSIVE_SUFFIXES = ('nya', 'ku', 'mu')
+VOWELS = 'aiueo'
+MIN_STEM_LENGTH = 3
+
+
+def _strip_suffix(word, suffixes):
+    for suffix in suffixes:
+        if word.endswith(suffix) and len(word) - len(suffix) >= MIN_STEM_LENGTH:
+            return word[:-len(suffix)]
+    return word
+
+
+def _strip_prefix(word):
+    """Remove one derivational prefix, restoring the assimilated first letter"""
+    def follows_vowel(prefix):
+        return len(word) > len(prefix) and word[len(prefix)] in VOWELS
+
+    for prefix in ('di', 'ke', 'se'):
+        if word.startswith(prefix):
+            return word[len(prefix):]
+
+    for prefix in ('ber', 'ter', 'per'):
+        if word.startswith(prefix):
+            return word[len(prefix):]
+
+    for base in ('me', 'pe'):
+        if not word.startswith(base):
+            continue
+        if word.startswith(base + 'ng'):
+            return word[len(base) + 2:]
+        if word.startswith(base + 'ny'):
+            return 's' + word[len(base) + 2:]
+        if word.startswith(base + 'm'):
+            return ('p' + word[len(base) + 1:]) if follows_vowel(base + 'm') else word[len(base) + 1:]
+        if word.startswith(base + 'n'):
+            return ('t' + word[len(base) + 1:]) if follows_vowel(base + 'n') else word[len(base) + 1:]
+        if word.startswith(base + 'r'):
+            return word[len(base) + 1:]
+        return word[len(base):]
+
+    return word
+
+
+def stem(word):
+    """Reduce an Indonesian word to an approximate root (e.g. kebijakan -> bijak)"""
+    if len(word) <= MIN_STEM_LENGTH + 1 or not word.isalpha():
+        return word
+
+    word = _strip_suffix(word, PARTICLE_SUFFIXES)
+    word = _strip_suffix(word, POSSESSIVE_SUFFIXES)
+
+    core = _strip_prefix(word)
+    if len(core) < MIN_STEM_LENGTH + 1:
+        core = word
+    has_prefix = core != word
+
+    # A second stacked prefix only after me-/di-/ke-/se- (memper-, diper-, keber-),
+    # and only when a reasonably long root remains
+    if has_prefix and not word.startswith('pe') and core.startswith(('per', 'ber')) and len(core) >= 8:
+        core = core[3:]
+
+    # Nominal confixes pe-...-an and ke-...-an take "-an", not "-kan"
+    # (pendidikan -> didik, kebijakan -> bijak); "-i" only follows a prefix
+    if has_prefix and word.startswith(('pe', 'ke')):
+        suffixes = ('an',)
+    elif has_prefix:
+        suffixes = ('kan', 'an', 'i')
+    else:
+        suffixes = ('kan', 'an')
+
+    for suffix in suffixes:
+        if core.endswith(suffix) and len(core) - len(suffix) >= MIN_STEM_LENGTH + 1:
+            return core[:-len(suffix)]
+    return core
+
+
+def tokenize(text):
+    """Lowercase word tokens of text, without stop words"""
+    if not text:
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOP_WORDS]
+
+
+def analyze(text):
+    """Stemmed index terms of text"""
+    return [stem(token) for token in tokenize(text)]
+
+
+class InvertedIndex:
+    """In-memory inverted index with BM25 ranking.
+
+    Searching only visits the postings of the query terms, so its cost depends
+    on how many documents match rather than on the size of the collection.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.lock = threading.RLock()
+        self.postings = {}  # {term: {doc_id: term_frequency}}
+        self.doc_terms = {}  # {doc_id: {term: term_frequency}}
+        self.doc_lengths = {}  # {doc_id: number of terms}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.doc_lengths)
+
+    def clear(self):
+        with self.lock:
+            self.postings = {}
+            self.doc_terms = {}
+            self.doc_lengths = {}
+            self.total_length = 0
+
+    def add(self, doc_id, text):
+        """Index (or re-index) a document"""
+        terms = analyze(text)
+        frequencies = {}
+        for term in terms:
+            frequencies[term] = frequencies.get(term, 0) + 1
+
+        with self.lock:
+            self.remove(doc_id)
+            for term, frequency in frequencies.items():
+                self.postings.setdefault(term, {})[doc_id] = frequency
+            self.doc_terms[doc_id] = frequencies
+            self.doc_lengths[doc_id] = len(terms)
+            self.total_length += len(terms)
+
+    def remove(self, doc_id):
+        with self.lock:
+            frequencies = self.doc_terms.pop(doc_id, None)
+            if frequencies is None:
+                return
+            for term in frequencies:
+                term_postings = self.postings.get(term)
+                if term_postings is not None:
+                    term_postings.pop(doc_id, None)
+                    if not term_postings:
+                        del self.postings[term]
+            self.total_length -= self.doc_lengths.pop(doc_id, 0)
+
+    def search(self, query):
+        """Return [(doc_id, score), ...] for documents matching any query term, best first"""
+        query_terms = set(analyze(query))
+        scores = {}
+
+        with self.lock:
+            document_count = len(self.doc_lengths)
+            if not document_count:
+                return []
+            average_length = self.total_length / document_count or 1
+
+            for term in query_terms:
+                term_postings = self.postings.get(term)
+                if not term_postings:
+                    continue
+                document_frequency = len(term_postings)
+                idf = math.log(1 + (document_count - document_frequency + 0.5) / (document_frequency + 0.5))
+                for doc_id, frequency in term_postings.items():
+                    length_norm = self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / average_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1) / (frequency + length_norm)
+
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+class TfidfIndex(InvertedIndex):
+    """Sparse TF-IDF vectors over the inverted index, ranked by cosine similarity.
+
+    Term weights are (1 + log tf) * idf. Scoring walks the postings of the
+    query's terms only. A changed document gets its norm recomputed on the
+    spot; the norms of the others (which shift with idf) are only refreshed
+    once changes since the last full pass exceed STALE_NORM_RATIO of the index.
+    """
+
+    STALE_NORM_RATIO = 0.1
+
+    def __init__(self):
+        super().__init__()
+        self.norms = None  # {doc_id: L2 norm of the document vector}, None until computed
+        self.changes_since_norms = 0
+
+    def clear(self):
+        with self.lock:
+            super().clear()
+            self.norms = None
+
+    def add(self, doc_id, text):
+        with self.lock:
+            super().add(doc_id, text)
+            if self.norms is not None:
+                self.norms[doc_id] = self._norm(self.doc_terms[doc_id])
+                self.changes_since_norms += 1
+
+    def remove(self, doc_id):
+        with self.lock:
+            super().remove(doc_id)
+            if self.norms is not None and self.norms.pop(doc_id, None) is not None:
+                self.changes_since_norms += 1
+
+    def _idf(self, term):
+        # Smoothed idf, stays positive for terms found in every document
+        document_frequency = len(self.postings.get(term, ()))
+        return math.log((1 + len(self.doc_lengths)) / (1 + document_frequency)) + 1
+
+    def _weights(self, frequencies):
+        return {term: (1 + math.log(frequency)) * self._idf(term) for term, frequency in frequencies.items()}
+
+    def _norm(self, frequencies):
+        return math.sqrt(sum(weight * weight for weight in self._weights(frequencies).values()))
+
+    def _ensure_norms(self):
+        if self.norms is not None and self.changes_since_norms <= self.STALE_NORM_RATIO * len(self.doc_lengths):
+            return
+        idfs = {term: self._idf(term) for term in self.postings}
+        self.norms = {
+            doc_id: math.sqrt(sum(((1 + math.log(frequency)) * idfs[term]) ** 2 for term, frequency in frequencies.items()))
+            for doc_id, frequencies in self.doc_terms.items()
+        }
+        self.changes_since_norms = 0
+
+    def _similar(self, frequencies, limit, exclude):
+        query_weights = self._weights(frequencies)
+        query_norm = math.sqrt(sum(weight * weight for weight in query_weights.values()))
+        if not query_norm:
+            return []
+
+        self._ensure_norms()
+        dot_products = {}
+        for term, query_weight in query_weights.items():
+            term_postings = self.postings.get(term)
+            if not term_postings:
+                continue
+            idf = self._idf(term)
+            for doc_id, frequency in term_postings.items():
+                dot_products[doc_id] = dot_products.get(doc_id, 0.0) + query_weight * (1 + math.log(frequency)) * idf
+
+        scores = (
+            (doc_id, dot_product / (query_norm * self.norms[doc_id]))
+            for doc_id, dot_product in dot_products.items()
+            if doc_id not in exclude and self.norms[doc_id]
+        )
+        return heapq.nlargest(limit, scores, key=lambda item: (item[1], -item[0]))
+
+    def similar_to_text(self, text, limit=10):
+        """Return the limit documents most similar to text as [(doc_id, cosine), ...]"""
+        frequencies = {}
+        for term in analyze(text):
+            frequencies[term] = frequencies.get(term, 0) + 1
+        with self.lock:
+            return self._similar(frequencies, limit, ())
+
+    def similar_to_document(self, doc_id, limit=10):
+        """Return the limit documents most similar to an indexed document, excluding itself"""
+        with self.lock:
+            frequencies = self.doc_terms.get(doc_id)
+            if not frequencies:
+                return []
+            return self._similar(frequencies, limit, (doc_id,))
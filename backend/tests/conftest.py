@@ -0,0 +1,108 @@
+import itertools
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+
+import pytest
+
+# app.py connects and creates its tables at import time, so point it at a
+# throwaway SQLite database before the first import
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(tempfile.mkdtemp(), 'smartpol_test.db') + '?timeout=30'
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as smartpol  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+
+_sequence = itertools.count(1)
+
+# Take SQLite's write lock when a transaction starts, so concurrent writers
+# wait on the busy timeout instead of failing with "database is locked" when
+# upgrading a read lock (the pysqlite recipe from the SQLAlchemy docs). BEGIN
+# goes to the driver connection so it stays out of the count_queries totals
+with smartpol.app.app_context():
+    _engine = smartpol.db.engine
+
+
+@event.listens_for(_engine, 'connect')
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(_engine, 'begin')
+def _begin_immediate(connection):
+    connection.connection.driver_connection.execute('BEGIN IMMEDIATE')
+
+
+_engine.dispose()
+
+
+@pytest.fixture
+def app():
+    smartpol.app.config['TESTING'] = True
+    return smartpol.app
+
+
+@pytest.fixture
+def make_user(app):
+    def make_user(role='konsituen', nik_verified=True):
+        name = f'user{next(_sequence)}'
+        with app.app_context():
+            user = smartpol.User(
+                username=name, full_name=name.title(), email=f'{name}@example.com',
+                role=role, nik_verified=nik_verified
+            )
+            user.set_password('password')
+            smartpol.db.session.add(user)
+            smartpol.db.session.commit()
+            return user.id
+    return make_user
+
+
+@pytest.fixture
+def make_poll(app):
+    def make_poll(created_by, option_count=3, **fields):
+        with app.app_context():
+            poll = smartpol.Polling(
+                title=f'Poll {next(_sequence)}', description='Test poll', category='umum',
+                created_by=created_by, **fields
+            )
+            smartpol.db.session.add(poll)
+            smartpol.db.session.flush()
+            for index in range(option_count):
+                smartpol.db.session.add(smartpol.PollingOption(polling_id=poll.id, option_text=f'Option {index}'))
+            smartpol.db.session.commit()
+            return poll.id, [option.id for option in poll.options]
+    return make_poll
+
+
+@pytest.fixture
+def client_for(app):
+    def client_for(user_id, role='konsituen'):
+        client = app.test_client()
+        with client.session_transaction() as flask_session:
+            flask_session['user_id'] = user_id
+            flask_session['role'] = role
+        return client
+    return client_for
+
+
+@pytest.fixture
+def count_queries(app):
+    """Context manager yielding a list that collects every SQL statement executed inside it"""
+    with app.app_context():
+        engine = smartpol.db.engine
+
+    @contextmanager
+    def count_queries():
+        statements = []
+
+        def record(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, 'before_cursor_execute', record)
+        try:
+            yield statements
+        finally:
+            event.remove(engine, 'before_cursor_execute', record)
+    return count_queries
@@ -0,0 +1,73 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import app as smartpol
+
+
+def test_poll_listing_query_count_does_not_grow_with_polls(make_user, make_poll, client_for, count_queries):
+    admin = make_user(role='admin')
+    voter = make_user()
+    client = client_for(voter)
+
+    poll_id, option_ids = make_poll(admin)
+    client.post(f'/api/polling/{poll_id}/vote', json={'option_id': option_ids[1]})
+
+    query_counts = []
+    for target in (5, 50):
+        with smartpol.app.app_context():
+            existing = smartpol.Polling.query.count()
+        for _ in range(target - existing):
+            make_poll(admin)
+
+        with count_queries() as statements:
+            response = client.get('/api/polling')
+        assert response.status_code == 200
+        assert len(response.get_json()['polls']) >= target
+        query_counts.append(len(statements))
+
+    # user lookup, polls with options, vote status: independent of the number of polls
+    assert query_counts[0] == query_counts[1] == 3
+
+    voted = [poll for poll in response.get_json()['polls'] if poll['id'] == poll_id][0]
+    assert voted['has_voted'] is True
+    assert voted['voted_option_id'] == option_ids[1]
+
+
+def test_concurrent_votes_keep_counters_exact(app, make_user, make_poll, client_for):
+    admin = make_user(role='admin')
+    poll_id, option_ids = make_poll(admin)
+    with app.app_context():
+        users = [
+            smartpol.User(
+                username=f'concurrent{index}', full_name='Voter', email=f'concurrent{index}@example.com',
+                role='konsituen', nik_verified=True, password_hash='x'
+            )
+            for index in range(2000)
+        ]
+        smartpol.db.session.add_all(users)
+        smartpol.db.session.commit()
+        voter_ids = [user.id for user in users]
+
+    def vote(user_id):
+        response = client_for(user_id).post(
+            f'/api/polling/{poll_id}/vote', json={'option_id': option_ids[user_id % len(option_ids)]}
+        )
+        return response.status_code
+
+    # Every voter votes once, and the first 300 retry to exercise the duplicate path
+    with ThreadPoolExecutor(16) as executor:
+        statuses = list(executor.map(vote, voter_ids + voter_ids[:300]))
+
+    assert statuses.count(200) == len(voter_ids)
+    assert statuses.count(400) == 300
+
+    with app.app_context():
+        expected = dict(
+            smartpol.db.session.query(smartpol.PollingVote.option_id, smartpol.db.func.count(smartpol.PollingVote.id))
+            .filter(smartpol.PollingVote.polling_id == poll_id)
+            .group_by(smartpol.PollingVote.option_id)
+            .all()
+        )
+        poll = smartpol.db.session.get(smartpol.Polling, poll_id)
+        assert sum(expected.values()) == len(voter_ids)
+        assert poll.total_votes == len(voter_ids)
+        assert {option.id: option.votes_count for option in poll.options} == expected
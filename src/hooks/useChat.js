@@ -3,6 +3,20 @@ import { chatAPI, authAPI, reportAPI, pollingPublikAPI } from '../services/api';
 import { deepseekAPI } from '../services/deepseek';
 import { v4 as uuidv4 } from 'uuid';
 
+// Number of recent messages loaded into the chat window, and per "load earlier" page
+const CHAT_HISTORY_TAIL = 50;
+
+const formatHistoryMessage = (msg) => ({
+  text: msg.message,
+  isUser: msg.is_user,
+  timestamp: new Date(msg.timestamp).toLocaleTimeString('id-ID', { hour: '2-digit', minute: '2-digit' })
+});
+
+const toConversationEntry = (msg) => ({
+  role: msg.is_user ? 'user' : 'assistant',
+  content: msg.message
+});
+
 // Function to get user info from localStorage or API
 const getUserInfo = async () => {
   try {
@@ -20,6 +34,7 @@ const getUserInfo = async () => {
           dapil_info: contextResponse.dapil_info || null,
           officials: contextResponse.officials || null,
           chat_history_count: contextResponse.chat_history_count || 0,
+          topic_interests: (contextResponse.topic_interests || []).map(item => item.topic),
           preferences: contextResponse.preferences || null
         };
       }
@@ -425,6 +440,8 @@ export const useChat = () => {
   const [currentPersona, setCurrentPersona] = useState('pico'); // 'pico' or 'official'
   const [currentOfficial, setCurrentOfficial] = useState(null);
   const [smartpolMembers, setSmartpolMembers] = useState([]);
+  // Keyset cursor for paging back through history loaded with tail
+  const [historyCursor, setHistoryCursor] = useState({ sessionId: null, firstId: null, hasMore: false });
 
   // Initialize user info and welcome message
   useEffect(() => {
@@ -449,14 +466,17 @@ export const useChat = () => {
   const loadChatHistory = async (sessionIdParam = null) => {
     try {
       setLoading(true);
-      const response = await chatAPI.getChatHistory(sessionIdParam);
+      const response = await chatAPI.getChatHistory(sessionIdParam, { tail: CHAT_HISTORY_TAIL });
       
-      if (response.messages && response.messages.length > 0) {
-        const formattedMessages = response.messages.map(msg => ({
-          text: msg.message,
-          isUser: msg.is_user,
-          timestamp: new Date(msg.timestamp).toLocaleTimeString('id-ID', { hour: '2-digit', minute: '2-digit' })
-        }));
+      const history = response.chat_history || [];
+      setHistoryCursor({
+        sessionId: sessionIdParam,
+        firstId: response.first_id ?? null,
+        hasMore: Boolean(response.has_more)
+      });
+      
+      if (history.length > 0) {
+        const formattedMessages = history.map(formatHistoryMessage);
         setMessages([welcomeMessage, ...formattedMessages]);
         
         // Update session ID if loading specific session
@@ -467,10 +487,7 @@ export const useChat = () => {
         }
         
         // Update conversation history for AI context
-        const conversationContext = response.messages.map(msg => ({
-          role: msg.is_user ? 'user' : 'assistant',
-          content: msg.message
-        }));
+        const conversationContext = history.map(toConversationEntry);
         setConversationHistory(conversationContext);
         
         // Check if we need to generate summary for this session
@@ -499,6 +516,36 @@ export const useChat = () => {
     }
   };
 
+  // Prepend the page of messages before the earliest one shown
+  const loadEarlierMessages = async () => {
+    if (!historyCursor.hasMore || historyCursor.firstId == null) {
+      return;
+    }
+    
+    try {
+      setLoading(true);
+      const response = await chatAPI.getChatHistory(historyCursor.sessionId, {
+        before_id: historyCursor.firstId,
+        limit: CHAT_HISTORY_TAIL
+      });
+      const history = response.chat_history || [];
+      
+      setHistoryCursor({
+        sessionId: historyCursor.sessionId,
+        firstId: response.first_id ?? historyCursor.firstId,
+        hasMore: Boolean(response.has_more)
+      });
+      if (history.length > 0) {
+        setMessages(prev => [welcomeMessage, ...history.map(formatHistoryMessage), ...prev.slice(1)]);
+        setConversationHistory(prev => [...history.map(toConversationEntry), ...prev]);
+      }
+    } catch (error) {
+      console.error('Error loading earlier chat history:', error);
+    } finally {
+      setLoading(false);
+    }
+  };
+
   // Function to switch to official persona
   const switchToOfficialPersona = async (officialName) => {
     try {
@@ -737,8 +784,12 @@ ${personaMessage}`
     }
 
     try {
-      // Save user message to database
-      await chatAPI.saveChatMessage(text.trim(), true, sessionId);
+      // The user message is saved together with the bot response in one batch
+      const userTurn = {
+        message: text.trim(),
+        is_user: true,
+        client_message_id: uuidv4()
+      };
 
       // Get AI response from DeepSeek API
       try {
@@ -751,6 +802,7 @@ ${personaMessage}`
           dapil_info: userInfo.dapil_info,
           officials: userInfo.officials,
           chat_history_count: userInfo.chat_history_count,
+          topic_interests: userInfo.topic_interests,
           preferences: userInfo.preferences
         } : null;
         
@@ -809,11 +861,14 @@ ${personaMessage}`
         // Update conversation history with AI response
         setConversationHistory(prev => [...prev, { role: 'assistant', content: displayMessage }]);
 
-        // Save bot response to database
+        // Save the user message and bot response to database
         try {
-          await chatAPI.saveChatMessage(aiResponse, false, sessionId);
+          await chatAPI.saveChatMessages([
+            userTurn,
+            { message: aiResponse, is_user: false, client_message_id: uuidv4() }
+          ], sessionId);
         } catch (error) {
-          console.error('Error saving bot message:', error);
+          console.error('Error saving chat messages:', error);
         }
         
         // Check if conversation should be summarized (after 10+ messages)
@@ -830,9 +885,16 @@ ${personaMessage}`
         };
         setMessages(prev => [...prev, errorMessage]);
         setIsTyping(false);
+
+        // Still keep the user message
+        try {
+          await chatAPI.saveChatMessages([userTurn], sessionId);
+        } catch (saveError) {
+          console.error('Error saving user message:', saveError);
+        }
       }
     } catch (error) {
-      console.error('Error saving user message:', error);
+      console.error('Error sending message:', error);
       setIsTyping(false);
     }
   };
@@ -904,6 +966,7 @@ ${personaMessage}`
     }
     
     setMessages([welcomeMessage]);
+    setHistoryCursor({ sessionId: null, firstId: null, hasMore: false });
     setSessionId(generateSessionId());
     setConversationHistory([]);
   };
@@ -929,6 +992,7 @@ ${personaMessage}`
     const newSessionId = generateSessionId();
     setSessionId(newSessionId);
     setMessages([welcomeMessage]);
+    setHistoryCursor({ sessionId: null, firstId: null, hasMore: false });
     setConversationHistory([]);
   };
 
@@ -944,6 +1008,8 @@ ${personaMessage}`
     sendMessage,
     clearChat,
     loadChatHistory,
+    loadEarlierMessages,
+    hasEarlierMessages: historyCursor.hasMore,
     startNewSession,
     switchToOfficialPersona,
     switchToPicoPersona,
@@ -72,7 +72,7 @@ const Policies = () => {
         setLoading(true);
       }
       
-      const response = await policiesAPI.getPolicies();
+      const response = await policiesAPI.getPolicies({ view: 'summary' });
       setPolicies(response.policies || []);
       setLastUpdated(new Date());
       
@@ -99,8 +99,16 @@ const Policies = () => {
     return matchesSearch && matchesTab;
   });
 
-  const handlePolicyClick = (policy) => {
+  const handlePolicyClick = async (policy) => {
     setSelectedPolicy(policy);
+    try {
+      // The list is loaded without content, fetch it when a policy is opened
+      const response = await policiesAPI.getPolicyContent(policy.id);
+      setSelectedPolicy(current => current && current.id === policy.id ? { ...current, content: response.content } : current);
+    } catch (error) {
+      message.error('Gagal memuat isi kebijakan');
+      console.error('Error fetching policy content:', error);
+    }
   };
 
   const handleBackToList = () => {
@@ -193,10 +193,40 @@ export const pollingAPI = {
 
 // Policies API functions
 export const policiesAPI = {
-  // Get all policies
-  getPolicies: async () => {
+  // Get all policies (pass { view: 'summary' } to skip the content field)
+  getPolicies: async (params = {}) => {
     try {
-      const response = await api.get('/policies');
+      const response = await api.get('/policies', { params });
+      return response.data;
+    } catch (error) {
+      throw error.response?.data || { error: 'Network error' };
+    }
+  },
+
+  // Get the full content of a single policy
+  getPolicyContent: async (policyId) => {
+    try {
+      const response = await api.get(`/policies/${policyId}/content`);
+      return response.data;
+    } catch (error) {
+      throw error.response?.data || { error: 'Network error' };
+    }
+  },
+
+  // Get policies related to another policy
+  getRelatedPolicies: async (policyId, limit = 5) => {
+    try {
+      const response = await api.get(`/policies/${policyId}/related`, { params: { limit } });
+      return response.data;
+    } catch (error) {
+      throw error.response?.data || { error: 'Network error' };
+    }
+  },
+
+  // Get policies related to a free-text topic
+  searchRelatedPolicies: async (query, limit = 5) => {
+    try {
+      const response = await api.get('/policies/related', { params: { q: query, limit } });
       return response.data;
     } catch (error) {
       throw error.response?.data || { error: 'Network error' };
@@ -217,9 +247,10 @@ export const policiesAPI = {
 // Reports API functions
 export const reportAPI = {
   // Get all reports
-  getReports: async () => {
+  // Optional params: status, category, priority, and limit/after for keyset pages
+  getReports: async (params = {}) => {
     try {
-      const response = await api.get('/reports');
+      const response = await api.get('/reports', { params });
       return response.data;
     } catch (error) {
       throw error.response?.data || { error: 'Network error' };
@@ -390,10 +421,12 @@ export const adminAPI = {
 // Chat History API
 export const chatAPI = {
   // Get chat history
-  getChatHistory: async (sessionId = null) => {
+  // params: { limit, before_id, after_id } for keyset pages, or { tail } for the last N messages
+  getChatHistory: async (sessionId = null, params = {}) => {
     try {
-      const url = sessionId ? `/chat/history?session_id=${sessionId}` : '/chat/history';
-      const response = await api.get(url);
+      const response = await api.get('/chat/history', {
+        params: sessionId ? { ...params, session_id: sessionId } : params
+      });
       return response.data;
     } catch (error) {
       throw error.response?.data || { error: 'Network error' };
@@ -414,10 +447,26 @@ export const chatAPI = {
     }
   },
 
+  // Save an ordered list of chat messages in one request.
+  // Each message is { message, is_user, client_message_id }; resending the same
+  // client_message_id does not create duplicates.
+  saveChatMessages: async (messages, sessionId = null) => {
+    try {
+      const response = await api.post('/chat/history/batch', {
+        session_id: sessionId,
+        messages
+      });
+      return response.data;
+    } catch (error) {
+      throw error.response?.data || { error: 'Network error' };
+    }
+  },
+
   // Get chat sessions
-  getChatSessions: async () => {
+  // params: { limit, after } for keyset pages (next_cursor is returned as the next "after")
+  getChatSessions: async (params = {}) => {
     try {
-      const response = await api.get('/chat/sessions');
+      const response = await api.get('/chat/sessions', { params });
       return response.data;
     } catch (error) {
       throw error.response?.data || { error: 'Network error' };
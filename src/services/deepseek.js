@@ -94,6 +94,9 @@ export const deepseekService = {
         if (userContext.dapil !== 'Tidak diketahui') {
           systemPrompt += `- ${userContext.dapil}\n`;
         }
+        if (userContext.topic_interests && userContext.topic_interests.length > 0) {
+          systemPrompt += `- Topik yang sering dibahas: ${userContext.topic_interests.slice(0, 5).join(', ')}\n`;
+        }
         systemPrompt += `\nGunakan informasi ini untuk memberikan respons yang lebih personal dan relevan dengan lokasi user. Jika membahas isu politik atau kebijakan, kamu bisa merujuk pada konteks daerah mereka jika relevan.`;
       }
       